@@ -3,25 +3,35 @@ Multi-Game Flask Application
 Main application that serves a game catalog and hosts multiple games.
 """
 
+# Patch the standard library for green threads before anything else imports it,
+# so HTTP routes and socket handlers share eventlet's green-thread pool
+import eventlet
+eventlet.monkey_patch()
+
 from flask import Flask, render_template, request, jsonify, session
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import uuid
 import json
+import logging
 import os
 from datetime import datetime
-import threading
 import time
 
 # Import shared utilities
-from shared.debug_utils import debug_function, set_debug, clear_debug_log, get_debug_log_path
+from shared.debug_utils import debug_function, set_debug, clear_debug_log, get_debug_log_path, configure_logging
+from shared import json_utils
 
 # Import game registry system
-from games import load_all_games, get_available_games, get_game_blueprint
+from games import GAME_REGISTRY, load_all_games, get_available_games, get_game_blueprint, cleanup_all_games
+
+logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__, 
            template_folder='shared/templates',
            static_folder='static')
+app.json_provider_class = json_utils.OrjsonProvider
+app.json = app.json_provider_class(app)
 
 # Use environment variable for secret key, fallback to generated key for development
 import secrets
@@ -37,23 +47,30 @@ default_origins = [
     'http://127.0.0.1:8080'
 ]
 allowed_origins = os.getenv('ALLOWED_ORIGINS', ','.join(default_origins)).split(',')
-socketio = SocketIO(app, cors_allowed_origins=allowed_origins)
+# Set REDIS_URL to route emits through a Redis message queue, so several server
+# processes (or external scripts) can broadcast to the same clients
+socketio = SocketIO(app, cors_allowed_origins=allowed_origins, json=json_utils, async_mode='eventlet',
+                    message_queue=os.getenv('REDIS_URL') or None)
 
 # Set debug mode (can be controlled via environment variable)
 debug_enabled = os.getenv('DEBUG', 'True').lower() == 'true'
 set_debug(debug_enabled)
+configure_logging(debug_enabled)
 
 # Load all games and register their blueprints
 load_all_games()
 
 # Register all game blueprints
-for game_info in get_available_games():
+for game_name in GAME_REGISTRY:
     try:
-        blueprint = get_game_blueprint(game_info['name'])
+        blueprint = get_game_blueprint(game_name)
         app.register_blueprint(blueprint)
-        print(f"[APP] Registered blueprint for game: {game_info['name']}")
+        logger.info("[APP] Registered blueprint for game: %s", game_name)
     except Exception as e:
-        print(f"[APP] Error registering blueprint for {game_info['name']}: {e}")
+        logger.error("[APP] Error registering blueprint for %s: %s", game_name, e)
+
+# Stats callable of each game, looked up once so /api/stats doesn't walk the registry
+STATS_COLLECTORS = {name: game.get_stats for name, game in GAME_REGISTRY.items()}
 
 # Register socket handlers for all games
 from games.mysticgrid import register_socket_handlers
@@ -82,18 +99,12 @@ def api_games():
 def api_stats():
     """API endpoint to get overall server statistics."""
     all_stats = {}
-    for game_info in get_available_games():
+    for name, get_stats in STATS_COLLECTORS.items():
         try:
-            blueprint = get_game_blueprint(game_info['name'])
-            # Get stats from each game (this would need to be implemented in each game)
-            all_stats[game_info['name']] = {
-                'active_players': 0,
-                'active_games': 0,
-                'total_players': 0
-            }
+            all_stats[name] = get_stats()
         except Exception as e:
-            print(f"[API] Error getting stats for {game_info['name']}: {e}")
-            all_stats[game_info['name']] = {
+            logger.error("[API] Error getting stats for %s: %s", name, e)
+            all_stats[name] = {
                 'active_players': 0,
                 'active_games': 0,
                 'total_players': 0
@@ -125,40 +136,44 @@ def get_debug_log():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-# Set up periodic cleanup (this would need to be coordinated across all games)
+# Set up periodic cleanup: one background task runs every game's cleanup hook
+CLEANUP_INTERVAL = 1800  # 30 minutes
+
 def periodic_cleanup():
-    """Run cleanup tasks every 30 minutes."""
+    """Run cleanup tasks every 30 minutes on a monotonic schedule."""
+    next_run = time.monotonic() + CLEANUP_INTERVAL
     while True:
+        socketio.sleep(max(0, next_run - time.monotonic()))
+        next_run = time.monotonic() + CLEANUP_INTERVAL
         try:
-            time.sleep(1800)  # 30 minutes
-            print("[CLEANUP] Running periodic cleanup...")
-            # Each game would handle its own cleanup
-            print("[CLEANUP] Cleanup completed")
+            logger.info("[CLEANUP] Running periodic cleanup...")
+            cleanup_all_games()
+            logger.info("[CLEANUP] Cleanup completed")
         except Exception as e:
-            print(f"[CLEANUP] Error during cleanup: {e}")
+            logger.error("[CLEANUP] Error during cleanup: %s", e)
 
-# Start cleanup thread
-cleanup_thread = threading.Thread(target=periodic_cleanup, daemon=True)
-cleanup_thread.start()
+# Start cleanup as a background task on the socketio async hub
+socketio.start_background_task(periodic_cleanup)
 
 # Global socket handlers (for cross-game functionality if needed)
 @socketio.on('connect')
 def handle_global_connect():
     """Handle global client connection."""
-    print(f"[GLOBAL_SOCKET] Client connected: {request.sid}")
+    logger.info("[GLOBAL_SOCKET] Client connected: %s", request.sid)
 
 @socketio.on('disconnect')
 def handle_global_disconnect():
     """Handle global client disconnection."""
-    print(f"[GLOBAL_SOCKET] Client disconnected: {request.sid}")
+    logger.info("[GLOBAL_SOCKET] Client disconnected: %s", request.sid)
 
 if __name__ == '__main__':
-    print("[APP] Starting Multi-Game Flask Application...")
-    print(f"[APP] Available games: {[game['name'] for game in get_available_games()]}")
-    print(f"[APP] Debug mode: {debug_enabled}")
+    logger.info("[APP] Starting Multi-Game Flask Application...")
+    logger.info("[APP] Available games: %s", [game['name'] for game in get_available_games()])
+    logger.info("[APP] Debug mode: %s", debug_enabled)
     
     # Run the application
     socketio.run(app, 
                 host=os.getenv('HOST', '0.0.0.0'),
                 port=int(os.getenv('PORT', 5000)),
-                debug=debug_enabled)
+                debug=debug_enabled,
+                use_reloader=False)
@@ -56,3 +56,7 @@ class BaseGame(ABC):
             'active_games': 0,
             'total_players': 0
         }
+    
+    def cleanup(self) -> None:
+        """Periodic cleanup of stale games and lobbies (optional override)."""
+        pass
@@ -5,53 +5,103 @@ Creates both static and interactive visualizations of the clue dependency tree.
 """
 
 import networkx as nx
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from pyvis.network import Network
 import random
+from collections import Counter
+from itertools import product
 from typing import List, Dict, Tuple, Set
 from game import Board, Clue, ClueType
 
+
+EXPLICIT_TMPL = "Cell {position} has {attribute} = {value}"
+GENERAL_TMPL = "{scope} {scope_index} has {count} {value}s"
+CONDITIONAL_TMPL = "If {condition}, then {consequence}"
+
+def _explicit_str(clue: Clue) -> str:
+    return EXPLICIT_TMPL.format(position=clue.position, attribute=clue.attribute, value=clue.value)
+
+def _gen_str(clue: Clue) -> str:
+    return GENERAL_TMPL.format(scope=clue.scope.capitalize(), scope_index=clue.scope_index,
+                               count=clue.count, value=clue.value)
+
+def _cond_str(clue: Clue) -> str:
+    return CONDITIONAL_TMPL.format(condition=_explicit_str(clue.condition),
+                                   consequence=_explicit_str(clue.consequence))
+
+# Clue type -> description builder, so _clue_to_string is a single lookup
+_STRING_DISPATCH = {
+    ClueType.EXPLICIT: _explicit_str,
+    ClueType.GENERAL: _gen_str,
+    ClueType.CONDITIONAL: _cond_str,
+}
+
+# Order and labels of the clue distribution printed by print_tree_analysis
+_TYPE_LABELS = (
+    (ClueType.EXPLICIT, "explicit"),
+    (ClueType.CONDITIONAL, "conditional"),
+    (ClueType.GENERAL, "general"),
+)
+
 class ClueTreeVisualizer:
-    def __init__(self, board: Board, clues: List[Clue], root_cells: List[Tuple[int, int]]):
+    # Node positions keyed by (board size, edge set); the layout is deterministic
+    # for a given graph, so renders of the same tree reuse it
+    _layout_cache: Dict[tuple, dict] = {}
+    
+    # Above this many edges the static view drops arrowheads for speed
+    MAX_ARROW_EDGES = 200
+    
+    def __init__(self, board: Board, clues: List[Clue], root_cells: List[Tuple[int, int]],
+                 layout_backend: str = 'networkx'):
         self.board = board
         self.clues = clues
         self.root_cells = root_cells
+        self.root_cells_set = frozenset(root_cells)  # for O(1) is-root checks
+        self.layout_backend = layout_backend  # 'networkx' or 'igraph'
         self.G = nx.DiGraph()
         self.clue_map = {}  # cell -> list of clues about that cell
         self.dependencies = {}  # cell -> list of cells that depend on it
+        self._clue_str_cache: Dict[int, str] = {}  # id(clue) -> description; clues don't change after generation
         
         self._build_graph()
     
     def _build_graph(self):
         """Build the NetworkX graph from clues."""
-        # Add nodes for all cells
-        for r in range(self.board.size):
-            for c in range(self.board.size):
-                cell = (r, c)
-                self.G.add_node(cell, pos=(c, -r))  # Invert y for proper display
-                
-                # Get actual cell data
-                actual_cell = self.board.board[r][c]
-                self.G.nodes[cell]['shape'] = actual_cell.shape
-                self.G.nodes[cell]['number'] = actual_cell.number
-                self.G.nodes[cell]['is_root'] = cell in self.root_cells
+        # Per-node attributes as parallel lists in node order, shared by both renderers
+        grid = self.board.board
+        self._nodes = list(product(range(self.board.size), repeat=2))
+        self._shapes = [grid[r][c].shape for r, c in self._nodes]
+        self._numbers = [grid[r][c].number for r, c in self._nodes]
+        self._is_root = [cell in self.root_cells_set for cell in self._nodes]
+        self._labels = [f"{cell}\n{number}({shape[0]})"
+                        for cell, number, shape in zip(self._nodes, self._numbers, self._shapes)]
+        
+        # Add nodes for all cells in one call
+        self.G.add_nodes_from(
+            ((r, c), {
+                'pos': (c, -r),  # Invert y for proper display
+                'shape': shape,
+                'number': number,
+                'is_root': is_root,
+            })
+            for (r, c), shape, number, is_root in zip(self._nodes, self._shapes, self._numbers, self._is_root)
+        )
         
         # Process clues to build edges and clue mapping
+        edges = []
         for i, clue in enumerate(self.clues):
-            if clue.clue_type.value == 1:  # EXPLICIT
+            clue_type = clue.clue_type
+            if clue_type is ClueType.EXPLICIT:
                 cell = clue.position
                 if cell not in self.clue_map:
                     self.clue_map[cell] = []
                 self.clue_map[cell].append((i, clue))
                 
-            elif clue.clue_type.value == 3:  # CONDITIONAL
+            elif clue_type is ClueType.CONDITIONAL:
                 condition_cell = clue.condition.position
                 consequence_cell = clue.consequence.position
                 
                 # Add edge from condition to consequence
-                self.G.add_edge(condition_cell, consequence_cell, 
-                              clue_type="conditional", clue_idx=i)
+                edges.append((condition_cell, consequence_cell,
+                              {'clue_type': "conditional", 'clue_idx': i}))
                 
                 if condition_cell not in self.dependencies:
                     self.dependencies[condition_cell] = []
@@ -60,50 +110,78 @@ class ClueTreeVisualizer:
                 if consequence_cell not in self.clue_map:
                     self.clue_map[consequence_cell] = []
                 self.clue_map[consequence_cell].append((i, clue))
-    
-    def create_static_visualization(self, filename: str = "clue_tree.png"):
-        """Create a static matplotlib visualization."""
-        plt.figure(figsize=(12, 10))
         
-        # Define colors for different node types
-        node_colors = []
-        node_sizes = []
+        self.G.add_edges_from(edges)
+    
+    def _layout(self) -> dict:
+        """Get node positions, computing the layout once per board size, edge set and backend."""
+        key = (self.board.size, frozenset(self.G.edges()), self.layout_backend)
+        pos = self._layout_cache.get(key)
+        if pos is None:
+            if self.layout_backend == 'igraph':
+                pos = self._igraph_layout()
+            if pos is None:
+                try:
+                    # sfdp scales far better than spring_layout but needs pygraphviz
+                    pos = nx.nx_agraph.graphviz_layout(self.G, prog='sfdp')
+                except (ImportError, OSError):
+                    # Start from the grid positions with a fixed seed so the result is repeatable
+                    pos = nx.spring_layout(self.G, k=3, iterations=50,
+                                           pos=nx.get_node_attributes(self.G, 'pos'), seed=0)
+            self._layout_cache[key] = pos
+        return pos
+    
+    def _igraph_layout(self):
+        """Fruchterman-Reingold positions from igraph's C core, or None if igraph isn't installed."""
+        try:
+            import igraph as ig
+        except ImportError:
+            return None
+        # Only the layout goes through igraph; self.G stays a NetworkX graph for pyvis
+        nodes = list(self.G.nodes())
+        coords = ig.Graph.from_networkx(self.G).layout_fruchterman_reingold(niter=50)
+        return {node: tuple(coords[i]) for i, node in enumerate(nodes)}
+    
+    def create_static_visualization(self, filename: str = "clue_tree.png", show: bool = False):
+        """Create a static matplotlib visualization, opening a window only if show is set."""
+        import numpy as np
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as mpatches
         
-        for node in self.G.nodes():
-            if self.G.nodes[node]['is_root']:
-                node_colors.append('#ff6b6b')  # Red for roots
-                node_sizes.append(1000)
-            else:
-                node_colors.append('#4ecdc4')  # Teal for derived nodes
-                node_sizes.append(600)
-        
-        # Define edge colors
-        edge_colors = []
-        for edge in self.G.edges():
-            edge_colors.append('#95a5a6')  # Gray for edges
+        if not show:
+            # Render off-screen; no GUI backend to initialize in batch runs
+            plt.switch_backend('Agg')
+        fig = plt.figure(figsize=(12, 10))
         
         # Draw the graph
-        pos = nx.spring_layout(self.G, k=3, iterations=50)
+        pos = self._layout()
+        edge_colors = '#95a5a6'  # Gray for edges
         
-        # Draw nodes
-        nx.draw_networkx_nodes(self.G, pos, 
-                              node_color=node_colors, 
-                              node_size=node_sizes,
-                              alpha=0.8)
+        # Draw all nodes as one scatter: red, larger roots and teal derived nodes
+        is_root = np.array(self._is_root, dtype=bool)
+        xy = np.array([pos[node] for node in self._nodes])
+        plt.scatter(xy[:, 0], xy[:, 1],
+                    c=np.where(is_root, '#ff6b6b', '#4ecdc4'),
+                    s=np.where(is_root, 1000, 600),
+                    alpha=0.8)
         
-        # Draw edges
-        nx.draw_networkx_edges(self.G, pos, 
-                              edge_color=edge_colors,
-                              arrows=True, 
-                              arrowsize=20,
-                              arrowstyle='->',
-                              alpha=0.6)
+        # Draw edges; arrows mean one FancyArrowPatch per edge, so large trees
+        # are drawn as a single LineCollection without arrowheads instead
+        if self.G.number_of_edges() > self.MAX_ARROW_EDGES:
+            nx.draw_networkx_edges(self.G, pos, 
+                                  edge_color=edge_colors,
+                                  arrows=False,
+                                  alpha=0.6)
+        else:
+            nx.draw_networkx_edges(self.G, pos, 
+                                  edge_color=edge_colors,
+                                  arrows=True, 
+                                  arrowsize=20,
+                                  arrowstyle='->',
+                                  alpha=0.6)
         
         # Draw labels
-        labels = {}
-        for node in self.G.nodes():
-            cell_data = self.G.nodes[node]
-            labels[node] = f"{node}\n{cell_data['number']}({cell_data['shape'][0]})"
+        labels = dict(zip(self._nodes, self._labels))
         
         nx.draw_networkx_labels(self.G, pos, labels, font_size=8, font_weight='bold')
         
@@ -118,41 +196,49 @@ class ClueTreeVisualizer:
         
         plt.axis('off')
         plt.tight_layout()
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(filename, dpi=300 if show else 150, bbox_inches='tight')
+        if show:
+            plt.show()
+        plt.close(fig)
         
         print(f"Static visualization saved as {filename}")
     
     def create_interactive_visualization(self, filename: str = "clue_tree.html"):
         """Create an interactive Pyvis visualization."""
+        from pyvis.network import Network
+        
         net = Network(height="800px", width="100%", bgcolor="#222222", font_color="white")
-        net.barnes_hut()
+        
+        # Ship fixed positions so the browser doesn't run a layout on load.
+        # sfdp and spring_layout use different units, so scale to a common span.
+        pos = self._layout()
+        span = max((abs(v) for xy in pos.values() for v in xy), default=0) or 1
+        scale = 400 / span
         
         # Add nodes
-        for node in self.G.nodes():
-            cell_data = self.G.nodes[node]
-            is_root = cell_data['is_root']
-            
+        for node, number, shape, is_root, label in zip(self._nodes, self._numbers, self._shapes,
+                                                       self._is_root, self._labels):
             # Node properties
             color = "#ff6b6b" if is_root else "#4ecdc4"
             size = 30 if is_root else 20
             
             # Create tooltip with cell info and clues
-            tooltip = f"Cell {node}<br>"
-            tooltip += f"Number: {cell_data['number']}<br>"
-            tooltip += f"Shape: {cell_data['shape']}<br>"
+            parts = [f"Cell {node}", f"Number: {number}", f"Shape: {shape}"]
             
             if node in self.clue_map:
-                tooltip += "<br>Clues:<br>"
-                for clue_idx, clue in self.clue_map[node]:
-                    clue_desc = self._clue_to_string(clue)
-                    tooltip += f"• {clue_desc}<br>"
+                parts.append("<br>Clues:")
+                parts.extend(f"• {self._clue_to_string(clue)}" for _, clue in self.clue_map[node])
+            
+            tooltip = "<br>".join(parts) + "<br>"
             
             net.add_node(str(node), 
-                        label=f"{node}\n{cell_data['number']}({cell_data['shape'][0]})",
+                        label=label,
                         color=color,
                         size=size,
-                        title=tooltip)
+                        title=tooltip,
+                        x=pos[node][0] * scale,
+                        y=-pos[node][1] * scale,  # vis.js y grows downwards
+                        physics=False)
         
         # Add edges
         for edge in self.G.edges():
@@ -175,8 +261,7 @@ class ClueTreeVisualizer:
         net.set_options("""
         var options = {
           "physics": {
-            "enabled": true,
-            "stabilization": {"iterations": 100}
+            "enabled": false
           },
           "interaction": {
             "hover": true,
@@ -191,15 +276,13 @@ class ClueTreeVisualizer:
     
     def _clue_to_string(self, clue: Clue) -> str:
         """Convert a clue to a readable string."""
-        if clue.clue_type.value == 1:  # EXPLICIT
-            return f"Cell {clue.position} has {clue.attribute} = {clue.value}"
-        elif clue.clue_type.value == 2:  # GENERAL
-            return f"{clue.scope.capitalize()} {clue.scope_index} has {clue.count} {clue.value}s"
-        elif clue.clue_type.value == 3:  # CONDITIONAL
-            cond = f"Cell {clue.condition.position} has {clue.condition.attribute} = {clue.condition.value}"
-            cons = f"Cell {clue.consequence.position} has {clue.consequence.attribute} = {clue.consequence.value}"
-            return f"If {cond}, then {cons}"
-        return "Unknown clue"
+        s = self._clue_str_cache.get(id(clue))
+        if s is not None:
+            return s
+        to_string = _STRING_DISPATCH.get(clue.clue_type)
+        s = to_string(clue) if to_string else "Unknown clue"
+        self._clue_str_cache[id(clue)] = s
+        return s
     
     def print_tree_analysis(self):
         """Print analysis of the dependency tree."""
@@ -213,10 +296,7 @@ class ClueTreeVisualizer:
         print(f"Root nodes: {len(self.root_cells)}")
         
         # Tree depth analysis
-        depths = {}
-        for root in self.root_cells:
-            depths[root] = 0
-            self._calculate_depths(root, depths, 0)
+        depths = self._calculate_depths()
         
         max_depth = max(depths.values()) if depths else 0
         print(f"Maximum tree depth: {max_depth}")
@@ -229,28 +309,25 @@ class ClueTreeVisualizer:
         print(f"Leaf nodes (no children): {sum(1 for d in out_degrees.values() if d == 0)}")
         
         # Clue type distribution
-        clue_types = {"explicit": 0, "conditional": 0, "general": 0}
-        for clue in self.clues:
-            if clue.clue_type.value == 1:
-                clue_types["explicit"] += 1
-            elif clue.clue_type.value == 2:
-                clue_types["general"] += 1
-            elif clue.clue_type.value == 3:
-                clue_types["conditional"] += 1
+        type_counts = Counter(clue.clue_type for clue in self.clues)
         
         print(f"\nClue distribution:")
-        for clue_type, count in clue_types.items():
-            print(f"  {clue_type.capitalize()}: {count}")
+        for clue_type, label in _TYPE_LABELS:
+            print(f"  {label.capitalize()}: {type_counts[clue_type]}")
         
         print("="*60)
     
-    def _calculate_depths(self, node, depths, current_depth):
-        """Calculate depths of all nodes reachable from a given node."""
-        if node in self.dependencies:
-            for child in self.dependencies[node]:
-                if child not in depths or depths[child] < current_depth + 1:
-                    depths[child] = current_depth + 1
-                    self._calculate_depths(child, depths, current_depth + 1)
+    def _calculate_depths(self) -> Dict[Tuple[int, int], int]:
+        """Longest distance from a root to every node reachable from one, in one topological pass."""
+        depths = {root: 0 for root in self.root_cells_set}
+        for node in nx.topological_sort(self.G):
+            if node not in depths:
+                continue
+            child_depth = depths[node] + 1
+            for child in self.G.successors(node):
+                if depths.get(child, -1) < child_depth:
+                    depths[child] = child_depth
+        return depths
 
 def visualize_clue_tree(board: Board, clues: List[Clue], root_cells: List[Tuple[int, int]], 
                        create_static: bool = True, create_interactive: bool = True):
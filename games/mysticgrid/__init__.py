@@ -9,8 +9,8 @@ from .. import register_game
 # Create game instance
 mysticgrid_game = MysticGridGame()
 
-# Register the game
-register_game(MysticGridGame)
+# Register the game (the registry shares this instance)
+register_game(mysticgrid_game)
 
 # Export the game class for registration
 __all__ = ['MysticGridGame', 'mysticgrid_game', 'register_socket_handlers']
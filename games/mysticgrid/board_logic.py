@@ -1,4 +1,6 @@
+import logging
 import random
+import sys
 
 """
 TODO: make sure that the board is fully solvable
@@ -8,15 +10,37 @@ TODO: make sure that the board is fully solvable
 
 
 
+from collections import Counter, defaultdict
 from enum import Enum
 from typing import Optional, Tuple, Union
 
+logger = logging.getLogger(__name__)
+
+# clue_visualizer is optional; its import is attempted once and the result kept
+_visualize_clue_tree = None
+_vis_checked = False
+
+def _load_visualizer():
+    """Return visualize_clue_tree, or None if the visualizer isn't importable."""
+    global _visualize_clue_tree, _vis_checked
+    if not _vis_checked:
+        _vis_checked = True
+        try:
+            from clue_visualizer import visualize_clue_tree as _visualize_clue_tree
+        except ImportError:
+            _visualize_clue_tree = None
+    return _visualize_clue_tree
+
 class ClueType(Enum):
     EXPLICIT = 1   # "Cell (r,c) is number 3"
     GENERAL  = 2   # "Row 2 contains two stars"
     CONDITIONAL = 3  # "If X then Y"
 
 class Clue:
+    __slots__ = ('clue_type', 'position', 'attribute', 'value', 'scope',
+                 'scope_index', 'count', 'condition', 'consequence',
+                 '_repr_cache', '_str_cache', '_dict_cache')
+
     def __init__(
         self,
         clue_type: ClueType,
@@ -38,18 +62,45 @@ class Clue:
         self.count = count
         self.condition = condition
         self.consequence = consequence
+        # Clues aren't modified after construction, so their text is built once
+        self._repr_cache = None
+        self._str_cache = None
+        self._dict_cache = None
 
     def __repr__(self):
-        if self.clue_type == ClueType.EXPLICIT:
+        if self._repr_cache is None:
+            self._repr_cache = self._compute_repr()
+        return self._repr_cache
+
+    def _compute_repr(self) -> str:
+        if self.clue_type is ClueType.EXPLICIT:
             return f"Cell{self.position} has {self.attribute}={self.value}"
-        elif self.clue_type == ClueType.GENERAL:
+        elif self.clue_type is ClueType.GENERAL:
             return f"{self.scope.capitalize()} {self.scope_index} has {self.count} {self.value}s"
-        elif self.clue_type == ClueType.CONDITIONAL:
+        elif self.clue_type is ClueType.CONDITIONAL:
             return f"If ({self.condition}), then ({self.consequence})"
         return "Unknown clue"
+
+    def to_string(self) -> str:
+        """Readable description of the clue, as shown in the dependency tree."""
+        if self._str_cache is None:
+            self._str_cache = self._compute_string()
+        return self._str_cache
+
+    def _compute_string(self) -> str:
+        if self.clue_type is ClueType.EXPLICIT:
+            return f"Cell {self.position} has {self.attribute} = {self.value}"
+        elif self.clue_type is ClueType.GENERAL:
+            return f"{self.scope.capitalize()} {self.scope_index} has {self.count} {self.value}s"
+        elif self.clue_type is ClueType.CONDITIONAL:
+            return f"If {self.condition.to_string()}, then {self.consequence.to_string()}"
+        return "Unknown clue"
     
     def to_dict(self):
-        """Convert clue to dictionary for JSON serialization."""
+        """Convert clue to dictionary for JSON serialization (built once, then shared)."""
+        if self._dict_cache is not None:
+            return self._dict_cache
+        
         result = {
             'clue_type': self.clue_type.value,  # Convert enum to int
             'position': self.position,
@@ -65,9 +116,71 @@ class Clue:
             result['condition'] = self.condition.to_dict()
         if self.consequence:
             result['consequence'] = self.consequence.to_dict()
-            
+        
+        self._dict_cache = result
         return result
 
+    def signature(self) -> tuple:
+        """Hashable key that identifies a clue by its content."""
+        build = _SIGNATURE_BUILDERS.get(self.clue_type)
+        return build(self) if build else ('?',)
+
+    @staticmethod
+    def _position_key(raw) -> Optional[tuple]:
+        """Turn a JSON [row, col] pair back into the tuple positions are stored as."""
+        try:
+            return (raw[0], raw[1])
+        except (TypeError, IndexError, KeyError):
+            return None
+
+    @staticmethod
+    def signature_from_dict(data: dict) -> Optional[tuple]:
+        """Build the same key as signature() from a clue dict sent by a client."""
+        try:
+            build = _DICT_SIGNATURE_BUILDERS.get(data.get('clue_type'))
+        except TypeError:  # unhashable clue_type
+            return None
+        return build(data) if build else None
+
+
+# signature() and signature_from_dict() builders, keyed by clue type (enum member / wire value)
+def _explicit_signature(clue: Clue) -> tuple:
+    return ('E', clue.position, clue.attribute, clue.value)
+
+def _general_signature(clue: Clue) -> tuple:
+    return ('G', clue.scope, clue.scope_index, clue.count, clue.value)
+
+def _conditional_signature(clue: Clue) -> tuple:
+    condition, consequence = clue.condition, clue.consequence
+    return ('C',
+            condition.position, condition.attribute, condition.value,
+            consequence.position, consequence.attribute, consequence.value)
+
+def _explicit_dict_signature(data: dict) -> tuple:
+    return ('E', Clue._position_key(data.get('position')), data.get('attribute'), data.get('value'))
+
+def _general_dict_signature(data: dict) -> tuple:
+    return ('G', data.get('scope'), data.get('scope_index'), data.get('count'), data.get('value'))
+
+def _conditional_dict_signature(data: dict) -> tuple:
+    condition = data.get('condition') or {}
+    consequence = data.get('consequence') or {}
+    return ('C',
+            Clue._position_key(condition.get('position')), condition.get('attribute'), condition.get('value'),
+            Clue._position_key(consequence.get('position')), consequence.get('attribute'), consequence.get('value'))
+
+_SIGNATURE_BUILDERS = {
+    ClueType.EXPLICIT: _explicit_signature,
+    ClueType.GENERAL: _general_signature,
+    ClueType.CONDITIONAL: _conditional_signature,
+}
+
+_DICT_SIGNATURE_BUILDERS = {
+    ClueType.EXPLICIT.value: _explicit_dict_signature,
+    ClueType.GENERAL.value: _general_dict_signature,
+    ClueType.CONDITIONAL.value: _conditional_dict_signature,
+}
+
 
 
 
@@ -89,9 +202,22 @@ shape_map = {
     'heart': '❤️',
 }
 
+ATTRIBUTES = ('number', 'shape')
+NUMBERS = (1, 2, 3, 4)
+SHAPES = tuple(shape_map)
+ALL_CARDS = tuple((shape, num) for num in NUMBERS for shape in SHAPES)
+
+# attribute -> actual value -> every other value, for drawing a false value in one pick
+WRONG_VALUES = {
+    'number': {n: tuple(x for x in NUMBERS if x != n) for n in NUMBERS},
+    'shape': {s: tuple(x for x in SHAPES if x != s) for s in SHAPES},
+}
+
 
 
 class Cell:
+    __slots__ = ('shape', 'number')
+
     def __init__(self, shape, number) -> None:
         self.shape = shape
         self.number = number
@@ -103,24 +229,31 @@ class Cell:
 class Board:
     def __init__(self, size: int = 3) -> None:
         self.size = size
+        # cell coordinates in row-major order, and per row / per column; built once per board
+        self._all_coords = tuple((r, c) for r in range(size) for c in range(size))
+        self._row_coords = tuple(self._all_coords[r * size:(r + 1) * size] for r in range(size))
+        self._col_coords = tuple(self._all_coords[c::size] for c in range(size))
         self.generate_random_board()
     
 
 
     def generate_random_board(self) -> None:
-        shapes, numbers = list(shape_map.keys()), [1,2,3,4]
-
-        # total unique cards = size × number of shapes
-        perms = [Cell(shape, num) for num in numbers for shape in shapes]
-
-        random.shuffle(perms)
-
-        # only take size*size cells
-        perms = perms[: self.size * self.size]
+        # total unique cards = size × number of shapes; sample the size*size
+        # (shape, number) pairs first so only cells on the board get built
+        pairs = random.sample(ALL_CARDS, self.size * self.size)
+        perms = [Cell(shape, num) for shape, num in pairs]
 
         # reshape into board rows
         self.board = [perms[i:i+self.size] for i in range(0, self.size * self.size, self.size)]
 
+        # value counts per (scope, index, attribute); cells never change once dealt,
+        # so every row/column is tallied once here instead of by each clue generator
+        self._line_counts = {}
+        for i in range(self.size):
+            for scope, cells in (("row", self.board[i]), ("col", self._column(i))):
+                for attribute in ATTRIBUTES:
+                    self._line_counts[(scope, i, attribute)] = Counter(getattr(cell, attribute) for cell in cells)
+
 
 
 
@@ -128,45 +261,52 @@ class Board:
 
 
 
-    def generate_all_clues(self, num_roots=2, vacuous_ratio=0.15) -> list[Clue]:
+    def generate_all_clues(self, num_roots=2, vacuous_ratio=0.15, visualize=False) -> list[Clue]:
         """
         Generate clues using a tree-based approach:
         1. Start with explicit clues as roots
         2. Build dependency tree where each clue depends on previous ones
         3. Ensure every cell is reachable through logical deduction
         """
+        # Bound once; the level loop below calls these for every known cell
+        choice, rand = random.choice, random.random
+        
         clues = []
         covered = set()  # Cells that have at least one clue
         fully_covered = set()  # Cells that have both shape and number clues
         
         # 1) Create root explicit clues
-        root_cells = random.sample(
-            [(r, c) for r in range(self.size) for c in range(self.size)], num_roots
-        )
+        # sample flat indices; a range indexes the same as the row-major cell list would
+        root_cells = [divmod(i, self.size)
+                      for i in random.sample(range(self.size * self.size), num_roots)]
         
         for pos in root_cells:
             # Generate one explicit clue per root cell
             clues.append(self.generate_order1_clue(pos))
             covered.add(pos)
         
-        print(f"DEBUG: Created {len(root_cells)} root explicit clues")
+        logger.debug("Created %d root explicit clues", len(root_cells))
         
         # 2) Build dependency tree level by level
         current_level = set(root_cells)
         level = 0
         
-        while len(covered) < self.size * self.size and level < 10:  # Prevent infinite loops
+        # Uncovered cells in row-major order, kept in step with covered
+        # instead of being rebuilt from the whole grid for every known cell
+        uncovered = [cell for cell in self._all_coords if cell not in covered]
+        
+        def cover(cell):
+            covered.add(cell)
+            uncovered.remove(cell)
+        
+        while uncovered and level < 10:  # Prevent infinite loops
             level += 1
             next_level = set()
             
-            print(f"DEBUG: Building level {level}, current covered: {len(covered)}/{self.size * self.size}")
+            logger.debug("Building level %d, current covered: %d/%d", level, len(covered), self.size * self.size)
             
             # For each cell in current level, try to create clues that help deduce other cells
             for known_cell in list(current_level):
-                # Find uncovered cells that could be deduced from this known cell
-                uncovered = [(r, c) for r in range(self.size) for c in range(self.size) 
-                           if (r, c) not in covered]
-                
                 if not uncovered:
                     break
                 
@@ -174,85 +314,83 @@ class Board:
                 clue_created = False
                 
                 # 2a) Try conditional clues (if-then relationships) - prioritize these
-                if random.random() < 0.7 and len(uncovered) > 0:
-                    target = random.choice(uncovered)
-                    vacuous = (random.random() < vacuous_ratio)
+                if rand() < 0.7:
+                    target = choice(uncovered)
+                    vacuous = (rand() < vacuous_ratio)
                     try:
                         clue = self.generate_order3_clue_known(known_cell, target, vacuous=vacuous)
                         clues.append(clue)
-                        covered.add(target)
+                        cover(target)
                         next_level.add(target)
                         clue_created = True
-                        print(f"DEBUG: Created conditional clue from {known_cell} to {target}")
+                        logger.debug("Created conditional clue from %s to %s", known_cell, target)
                     except Exception as e:
-                        print(f"DEBUG: Failed to create conditional clue: {e}")
+                        logger.debug("Failed to create conditional clue: %s", e)
                 
                 # 2b) Try general clues (row/col constraints) if no conditional clue was created
-                if not clue_created and len(uncovered) > 0:
+                if not clue_created:
                     # Find cells in same row or column
                     same_row_col = [cell for cell in uncovered 
                                   if cell[0] == known_cell[0] or cell[1] == known_cell[1]]
                     
                     if same_row_col:
-                        target = random.choice(same_row_col)
+                        target = choice(same_row_col)
                         try:
                             clue = self.generate_order2_clue_known(known_cell, target)
                             clues.append(clue)
-                            covered.add(target)
+                            cover(target)
                             next_level.add(target)
                             clue_created = True
-                            print(f"DEBUG: Created general clue from {known_cell} to {target}")
+                            logger.debug("Created general clue from %s to %s", known_cell, target)
                         except Exception as e:
-                            print(f"DEBUG: Failed to create general clue: {e}")
+                            logger.debug("Failed to create general clue: %s", e)
                 
                 # 2c) If still no clue created, try any conditional clue
-                if not clue_created and len(uncovered) > 0:
-                    target = random.choice(uncovered)
-                    vacuous = (random.random() < vacuous_ratio)
+                if not clue_created:
+                    target = choice(uncovered)
+                    vacuous = (rand() < vacuous_ratio)
                     try:
                         clue = self.generate_order3_clue_known(known_cell, target, vacuous=vacuous)
                         clues.append(clue)
-                        covered.add(target)
+                        cover(target)
                         next_level.add(target)
-                        print(f"DEBUG: Created fallback conditional clue from {known_cell} to {target}")
+                        logger.debug("Created fallback conditional clue from %s to %s", known_cell, target)
                     except Exception as e:
-                        print(f"DEBUG: Failed to create fallback clue: {e}")
+                        logger.debug("Failed to create fallback clue: %s", e)
                         # If all else fails, add a simple explicit clue for the target
                         clues.append(self.generate_order1_clue(target))
-                        covered.add(target)
+                        cover(target)
                         next_level.add(target)
-                        print(f"DEBUG: Added explicit clue for {target} as fallback")
+                        logger.debug("Added explicit clue for %s as fallback", target)
             
             current_level = next_level
             
             # If no progress was made, break to prevent infinite loops
             if not current_level:
-                print(f"DEBUG: No progress made at level {level}, breaking")
+                logger.debug("No progress made at level %d, breaking", level)
                 break
         
         # 3) Add cross-constraint clues to create interesting deduction chains
         # These clues help players deduce cells through multiple constraints
-        print("DEBUG: Adding cross-constraint clues")
+        logger.debug("Adding cross-constraint clues")
         
         # Add row/column constraint clues
         for i in range(self.size):
             # Row constraints
-            row_cells = [(i, c) for c in range(self.size)]
-            if len([cell for cell in row_cells if cell in covered]) >= 2:
+            if sum(cell in covered for cell in self._row_coords[i]) >= 2:
                 # Create a general clue about this row
                 clue = self.generate_row_constraint_clue(i)
                 if clue:
                     clues.append(clue)
-                    print(f"DEBUG: Added row constraint for row {i}")
+                    logger.debug("Added row constraint for row %d", i)
             
             # Column constraints
-            col_cells = [(r, i) for r in range(self.size)]
-            if len([cell for cell in col_cells if cell in covered]) >= 2:
+            if sum(cell in covered for cell in self._col_coords[i]) >= 2:
                 # Create a general clue about this column
                 clue = self.generate_col_constraint_clue(i)
                 if clue:
                     clues.append(clue)
-                    print(f"DEBUG: Added column constraint for column {i}")
+                    logger.debug("Added column constraint for column %d", i)
         
         # 3b) Add number-based constraint clues (e.g., "Row 0 has numbers 1,2,3")
         for i in range(self.size):
@@ -260,199 +398,144 @@ class Board:
             clue = self.generate_row_number_constraint_clue(i)
             if clue:
                 clues.append(clue)
-                print(f"DEBUG: Added row number constraint for row {i}")
+                logger.debug("Added row number constraint for row %d", i)
             
             # Column number constraints
             clue = self.generate_col_number_constraint_clue(i)
             if clue:
                 clues.append(clue)
-                print(f"DEBUG: Added column number constraint for column {i}")
+                logger.debug("Added column number constraint for column %d", i)
         
-        # 4) Ensure every cell has at least one clue
-        for r in range(self.size):
-            for c in range(self.size):
-                if (r, c) not in covered:
-                    # Add a simple explicit clue for uncovered cells
-                    clues.append(self.generate_order1_clue((r, c)))
-                    print(f"DEBUG: Added explicit clue for uncovered cell ({r}, {c})")
+        # 4) Ensure every cell has at least one clue; uncovered is still in row-major order
+        for cell in uncovered:
+            # Add a simple explicit clue for uncovered cells
+            clues.append(self.generate_order1_clue(cell))
+            logger.debug("Added explicit clue for uncovered cell %s", cell)
         
-        print(f"DEBUG: Generated {len(clues)} total clues")
+        logger.debug("Generated %d total clues", len(clues))
         
-        # Generate and print the dependency tree visualization
-        self.print_dependency_tree(clues, root_cells)
+        # Generate and print the dependency tree visualization; it's debug output,
+        # so skip building it unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            self.print_dependency_tree(clues, root_cells)
         
         # Create graphical visualizations if requested
-        try:
-            from clue_visualizer import visualize_clue_tree
-            print("\nCreating graphical visualizations...")
-            visualize_clue_tree(self, clues, root_cells, 
-                              create_static=True, create_interactive=True)
-        except ImportError:
-            print("Note: Install networkx, matplotlib, and pyvis for graphical visualizations")
-        except Exception as e:
-            print(f"Visualization error: {e}")
+        if visualize:
+            visualize_clue_tree = _load_visualizer()
+            if visualize_clue_tree is None:
+                print("Note: Install networkx, matplotlib, and pyvis for graphical visualizations")
+            else:
+                try:
+                    print("\nCreating graphical visualizations...")
+                    visualize_clue_tree(self, clues, root_cells, 
+                                      create_static=True, create_interactive=True)
+                except Exception as e:
+                    print(f"Visualization error: {e}")
         
         return clues
     
     def print_dependency_tree(self, clues: list[Clue], root_cells: list[tuple]):
         """Print a visual representation of the clue dependency tree."""
-        print("\n" + "="*60)
-        print("CLUE DEPENDENCY TREE")
-        print("="*60)
+        lines = ["", "="*60, "CLUE DEPENDENCY TREE", "="*60]
         
         # Build dependency graph
-        dependencies = {}  # cell -> list of cells that depend on it
-        clue_map = {}      # cell -> list of clues about that cell
+        dependencies = defaultdict(list)  # cell -> list of cells that depend on it
+        clue_map = defaultdict(list)      # cell -> list of clues about that cell
         
         for i, clue in enumerate(clues):
-            if clue.clue_type.value == 1:  # EXPLICIT
-                cell = clue.position
-                if cell not in clue_map:
-                    clue_map[cell] = []
-                clue_map[cell].append((i, clue))
+            if clue.clue_type is ClueType.EXPLICIT:
+                clue_map[clue.position].append((i, clue))
                 
-            elif clue.clue_type.value == 3:  # CONDITIONAL
-                condition_cell = clue.condition.position
+            elif clue.clue_type is ClueType.CONDITIONAL:
                 consequence_cell = clue.consequence.position
-                
-                if condition_cell not in dependencies:
-                    dependencies[condition_cell] = []
-                dependencies[condition_cell].append(consequence_cell)
-                
-                if consequence_cell not in clue_map:
-                    clue_map[consequence_cell] = []
+                dependencies[clue.condition.position].append(consequence_cell)
                 clue_map[consequence_cell].append((i, clue))
         
-        # Print tree starting from roots
+        # Walk the tree depth-first with an explicit stack, in the same order
+        # a recursive walk would visit it
         visited = set()
         
-        def print_node(cell, level=0, prefix=""):
-            if cell in visited:
-                return
-            visited.add(cell)
-            
-            indent = "  " * level
-            cell_display = f"({cell[0]},{cell[1]})"
-            
-            # Print this cell's clues
-            if cell in clue_map:
-                for clue_idx, clue in clue_map[cell]:
-                    clue_desc = self.clue_to_string(clue)
-                    print(f"{indent}{prefix}├─ {cell_display}: {clue_desc}")
-                    prefix = "│  " if level > 0 else "   "
-            
-            # Print dependent cells
-            if cell in dependencies:
-                for i, dep_cell in enumerate(dependencies[cell]):
-                    is_last = (i == len(dependencies[cell]) - 1)
-                    new_prefix = "└─ " if is_last else "├─ "
-                    print_node(dep_cell, level + 1, new_prefix)
+        def add_subtree(start):
+            stack = [(start, 0, "")]
+            while stack:
+                cell, level, prefix = stack.pop()
+                if cell in visited:
+                    continue
+                visited.add(cell)
+                
+                indent = "  " * level
+                cell_display = f"({cell[0]},{cell[1]})"
+                
+                # This cell's clues
+                if cell in clue_map:
+                    for clue_idx, clue in clue_map[cell]:
+                        clue_desc = self.clue_to_string(clue)
+                        lines.append(f"{indent}{prefix}├─ {cell_display}: {clue_desc}")
+                        prefix = "│  " if level > 0 else "   "
+                
+                # Dependent cells, pushed in reverse so the first is visited first
+                if cell in dependencies:
+                    children = dependencies[cell]
+                    last = len(children) - 1
+                    for i in range(last, -1, -1):
+                        stack.append((children[i], level + 1, "└─ " if i == last else "├─ "))
         
         # Start from root cells
-        print("ROOT NODES (Explicit Clues):")
+        lines.append("ROOT NODES (Explicit Clues):")
         for root_cell in root_cells:
-            print_node(root_cell)
+            add_subtree(root_cell)
         
-        # Print any cells not reached by the tree (shouldn't happen in good generation)
-        unreached = set()
-        for r in range(self.size):
-            for c in range(self.size):
-                if (r, c) not in visited and (r, c) in clue_map:
-                    unreached.add((r, c))
+        # Cells not reached by the tree (shouldn't happen in good generation)
+        unreached = {cell for cell in self._all_coords
+                     if cell not in visited and cell in clue_map}
         
         if unreached:
-            print("\nUNREACHED CELLS (Generation Issue):")
+            lines.append("\nUNREACHED CELLS (Generation Issue):")
             for cell in unreached:
-                print_node(cell)
+                add_subtree(cell)
         
-        # Print cross-constraint clues separately
-        print("\nCROSS-CONSTRAINT CLUES:")
+        # Cross-constraint clues separately
+        lines.append("\nCROSS-CONSTRAINT CLUES:")
         for i, clue in enumerate(clues):
-            if clue.clue_type.value == 2:  # GENERAL
+            if clue.clue_type is ClueType.GENERAL:
                 clue_desc = self.clue_to_string(clue)
-                print(f"  • {clue_desc}")
+                lines.append(f"  • {clue_desc}")
         
-        print("="*60)
+        lines.append("="*60)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def clue_to_string(self, clue: Clue) -> str:
         """Convert a clue to a readable string."""
-        if clue.clue_type.value == 1:  # EXPLICIT
-            return f"Cell {clue.position} has {clue.attribute} = {clue.value}"
-        elif clue.clue_type.value == 2:  # GENERAL
-            return f"{clue.scope.capitalize()} {clue.scope_index} has {clue.count} {clue.value}s"
-        elif clue.clue_type.value == 3:  # CONDITIONAL
-            cond = f"Cell {clue.condition.position} has {clue.condition.attribute} = {clue.condition.value}"
-            cons = f"Cell {clue.consequence.position} has {clue.consequence.attribute} = {clue.consequence.value}"
-            return f"If {cond}, then {cons}"
-        return "Unknown clue"
+        return clue.to_string()
     
-    def generate_row_constraint_clue(self, row: int) -> Optional[Clue]:
-        """Generate a general clue about a row (e.g., 'Row 0 has 2 stars')."""
-        row_cells = [self.board[row][c] for c in range(self.size)]
-        
-        # Count shapes in this row
-        shape_counts = {}
-        for cell in row_cells:
-            shape_counts[cell.shape] = shape_counts.get(cell.shape, 0) + 1
-        
-        # Find a shape that appears more than once
-        for shape, count in shape_counts.items():
+    def _line_count_clue(self, scope: str, index: int, attribute: str) -> Optional[Clue]:
+        """Count clue for the first value of attribute that repeats in a row or column."""
+        # Counter keeps first-seen order, so this picks the same value the scan always has
+        for value, count in self._line_counts[(scope, index, attribute)].items():
             if count > 1:
-                return Clue(ClueType.GENERAL, scope="row", scope_index=row, 
-                           count=count, value=shape)
+                return Clue(ClueType.GENERAL, scope=scope, scope_index=index,
+                           count=count, value=value)
         
         return None
     
+    def _column(self, col: int) -> list:
+        return [row[col] for row in self.board]
+    
+    def generate_row_constraint_clue(self, row: int) -> Optional[Clue]:
+        """Generate a general clue about a row (e.g., 'Row 0 has 2 stars')."""
+        return self._line_count_clue("row", row, "shape")
+    
     def generate_col_constraint_clue(self, col: int) -> Optional[Clue]:
         """Generate a general clue about a column (e.g., 'Column 0 has 3 hearts')."""
-        col_cells = [self.board[r][col] for r in range(self.size)]
-        
-        # Count shapes in this column
-        shape_counts = {}
-        for cell in col_cells:
-            shape_counts[cell.shape] = shape_counts.get(cell.shape, 0) + 1
-        
-        # Find a shape that appears more than once
-        for shape, count in shape_counts.items():
-            if count > 1:
-                return Clue(ClueType.GENERAL, scope="col", scope_index=col, 
-                           count=count, value=shape)
-        
-        return None
+        return self._line_count_clue("col", col, "shape")
     
     def generate_row_number_constraint_clue(self, row: int) -> Optional[Clue]:
         """Generate a general clue about numbers in a row (e.g., 'Row 0 has numbers 1,2,3')."""
-        row_cells = [self.board[row][c] for c in range(self.size)]
-        
-        # Count numbers in this row
-        number_counts = {}
-        for cell in row_cells:
-            number_counts[cell.number] = number_counts.get(cell.number, 0) + 1
-        
-        # Find a number that appears more than once
-        for number, count in number_counts.items():
-            if count > 1:
-                return Clue(ClueType.GENERAL, scope="row", scope_index=row, 
-                           count=count, value=number)
-        
-        return None
+        return self._line_count_clue("row", row, "number")
     
     def generate_col_number_constraint_clue(self, col: int) -> Optional[Clue]:
         """Generate a general clue about numbers in a column (e.g., 'Column 0 has numbers 1,2,3')."""
-        col_cells = [self.board[r][col] for r in range(self.size)]
-        
-        # Count numbers in this column
-        number_counts = {}
-        for cell in col_cells:
-            number_counts[cell.number] = number_counts.get(cell.number, 0) + 1
-        
-        # Find a number that appears more than once
-        for number, count in number_counts.items():
-            if count > 1:
-                return Clue(ClueType.GENERAL, scope="col", scope_index=col, 
-                           count=count, value=number)
-        
-        return None
+        return self._line_count_clue("col", col, "number")
 
 
 
@@ -463,7 +546,7 @@ class Board:
         r, c = position
         cell = self.board[r][c]
         if attribute is None:
-            attribute = random.choice(["number", "shape"])
+            attribute = random.choice(ATTRIBUTES)
         
         if attribute == "number":
             return Clue(ClueType.EXPLICIT, position=position, attribute="number", value=cell.number)
@@ -495,7 +578,7 @@ class Board:
 
         # pick a random cell from the scope and build a count clue
         chosen = random.choice(items)
-        count = sum(1 for x in items if x.shape == chosen.shape)
+        count = self._line_counts[(scope, scope_index, "shape")][chosen.shape]
         return Clue(
             ClueType.GENERAL,
             scope=scope,
@@ -517,16 +600,12 @@ class Board:
         # if they share a row, build a row clue
         if r_known == r_target:
             scope, scope_index = "row", r_known
-            items = self.board[r_known]
             chosen_shape = self.board[r_known][c_target].shape
-            count = sum(1 for cell in items if cell.shape == chosen_shape)
 
         # else if they share a column, build a column clue
         elif c_known == c_target:
             scope, scope_index = "col", c_known
-            items = [self.board[r][c_known] for r in range(self.size)]
             chosen_shape = self.board[r_target][c_target].shape
-            count = sum(1 for cell in items if cell.shape == chosen_shape)
 
         else:
             raise ValueError(
@@ -534,6 +613,7 @@ class Board:
                 f"Got known={known}, target={target}"
             )
 
+        count = self._line_counts[(scope, scope_index, "shape")][chosen_shape]
         return Clue(
             ClueType.GENERAL,
             scope=scope,
@@ -557,34 +637,32 @@ class Board:
     def generate_order3_clue_random(self, position, vacuous: bool = False) -> Clue:
         r, c = position
 
-        r2, c2 = r, c
-        while (r2, c2) == (r, c):
-            r2, c2 = random.randint(0, self.size-1), random.randint(0, self.size-1)
+        # any other cell: draw from the size*size - 1 flat indices, skipping over our own
+        flat = random.randrange(self.size * self.size - 1)
+        if flat >= r * self.size + c:
+            flat += 1
+        r2, c2 = divmod(flat, self.size)
 
         cell1, cell2 = self.board[r][c], self.board[r2][c2]
 
         if vacuous:
             # condition that is false for cell2
-            cond_attr = random.choice(["number", "shape"])
-            cond_value = random.choice([1,2,3,4]) if cond_attr == "number" else random.choice(["circle","square","star","heart"])
-            while getattr(cell2, cond_attr) == cond_value:
-                cond_value = random.choice([1,2,3,4]) if cond_attr == "number" else random.choice(["circle","square","star","heart"])
+            cond_attr = random.choice(ATTRIBUTES)
+            cond_value = random.choice(WRONG_VALUES[cond_attr][getattr(cell2, cond_attr)])
             condition = Clue(ClueType.EXPLICIT, position=(r2,c2), attribute=cond_attr, value=cond_value)
             
             #gnerate consequence that is false for cell1
-            cons_attr = random.choice(["number", "shape"])
-            cons_value = random.choice([1,2,3,4]) if cons_attr == "number" else random.choice(["circle","square","star","heart"])
-            while getattr(cell1, cons_attr) == cons_value:
-                cons_value = random.choice([1,2,3,4]) if cons_attr == "number" else random.choice(["circle","square","star","heart"])
+            cons_attr = random.choice(ATTRIBUTES)
+            cons_value = random.choice(WRONG_VALUES[cons_attr][getattr(cell1, cons_attr)])
             consequence = Clue(ClueType.EXPLICIT, position=(r,c), attribute=cons_attr, value=cons_value)
 
         else:
             # normal clue both sides are true
-            cond_attr = random.choice(["number", "shape"])
+            cond_attr = random.choice(ATTRIBUTES)
             cond_value = getattr(cell2, cond_attr)
             condition = Clue(ClueType.EXPLICIT, position=(r2,c2), attribute=cond_attr, value=cond_value)
 
-            cons_attr = random.choice(["number", "shape"])
+            cons_attr = random.choice(ATTRIBUTES)
             cons_value = getattr(cell1, cons_attr)
             consequence = Clue(ClueType.EXPLICIT, position=(r,c), attribute=cons_attr, value=cons_value)
 
@@ -609,25 +687,21 @@ class Board:
 
         if vacuous:
             # false condition, false consequence
-            cond_attr = random.choice(["number", "shape"])
-            cond_value = random.choice([1,2,3,4]) if cond_attr == "number" else random.choice(["circle","square","star","heart"])
-            while getattr(cell_known, cond_attr) == cond_value:
-                cond_value = random.choice([1,2,3,4]) if cond_attr == "number" else random.choice(["circle","square","star","heart"])
+            cond_attr = random.choice(ATTRIBUTES)
+            cond_value = random.choice(WRONG_VALUES[cond_attr][getattr(cell_known, cond_attr)])
             condition = Clue(ClueType.EXPLICIT, position=known, attribute=cond_attr, value=cond_value)
 
-            cons_attr = random.choice(["number", "shape"])
-            cons_value = random.choice([1,2,3,4]) if cons_attr == "number" else random.choice(["circle","square","star","heart"])
-            while getattr(cell_target, cons_attr) == cons_value:
-                cons_value = random.choice([1,2,3,4]) if cons_attr == "number" else random.choice(["circle","square","star","heart"])
+            cons_attr = random.choice(ATTRIBUTES)
+            cons_value = random.choice(WRONG_VALUES[cons_attr][getattr(cell_target, cons_attr)])
             consequence = Clue(ClueType.EXPLICIT, position=target, attribute=cons_attr, value=cons_value)
 
         else:
             # true condition, true consequence
-            cond_attr = random.choice(["number", "shape"])
+            cond_attr = random.choice(ATTRIBUTES)
             cond_value = getattr(cell_known, cond_attr)
             condition = Clue(ClueType.EXPLICIT, position=known, attribute=cond_attr, value=cond_value)
 
-            cons_attr = random.choice(["number", "shape"])
+            cons_attr = random.choice(ATTRIBUTES)
             cons_value = getattr(cell_target, cons_attr)
             consequence = Clue(ClueType.EXPLICIT, position=target, attribute=cons_attr, value=cons_value)
 
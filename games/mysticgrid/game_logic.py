@@ -1,22 +1,32 @@
 import uuid
 import json
+import logging
 import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional, Any
-from .board_logic import Board, Cell, Clue
-from shared.debug_utils import debug_method, debug_function
+from typing import Dict, List, Optional, Any
+from .board_logic import Board, Cell, Clue, ClueType
+from shared.debug_utils import debug_method, debug_function, Timed
+
+logger = logging.getLogger(__name__)
 
 
 class Player:
     """Represents a connected player in the game system."""
     
+    # Attributes serialized by to_dict(); assigning any of them drops the cached dict
+    _DICT_FIELDS = frozenset(('player_id', 'name', 'connected', 'current_lobby_id', 'current_game_id'))
+    
     @debug_method
     def __init__(self, player_id: str = None, name: str = None):
+        self._dict_cache = None
         self.player_id = player_id or str(uuid.uuid4())
         self.name = name or f"Player_{self.player_id[:8]}"
         self.websocket = None
         self.current_lobby_id = None
         self.current_game_id = None
+        self.current_game = None  # GameSession this player is in; current_game_id is kept for serialization
+        self.current_lobby = None  # Lobby this player is in; its cached state includes this player's dict
         self.connected = False
         self.joined_at = datetime.now()
     
@@ -39,27 +49,40 @@ class Player:
             try:
                 self.websocket.emit('message', message)
             except Exception as e:
-                print(f"Error sending message to player {self.player_id}: {e}")
+                logger.error("Error sending message to player %s: %s", self.player_id, e)
                 self.disconnect()
     
     
-    @debug_method
+    def __setattr__(self, name, value):
+        if name in Player._DICT_FIELDS:
+            object.__setattr__(self, '_dict_cache', None)
+            lobby = self.__dict__.get('current_lobby')
+            if lobby is not None:
+                lobby._state_cache = None
+        object.__setattr__(self, name, value)
+    
     def to_dict(self) -> dict:
-        """Convert player to dictionary for JSON serialization."""
-        return {
-            'player_id': self.player_id,
-            'name': self.name,
-            'connected': self.connected,
-            'current_lobby_id': self.current_lobby_id,
-            'current_game_id': self.current_game_id
-        }
+        """Convert player to dictionary for JSON serialization (cached until a field changes)."""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'player_id': self.player_id,
+                'name': self.name,
+                'connected': self.connected,
+                'current_lobby_id': self.current_lobby_id,
+                'current_game_id': self.current_game_id
+            }
+        return self._dict_cache
 
 
 class Lobby:
     """Represents a waiting room for players before a game starts."""
     
+    # Attributes included in get_lobby_state(); assigning any of them drops the cached state
+    _STATE_FIELDS = frozenset(('host_player_id', 'max_players', 'game_settings', 'status'))
+    
     @debug_method
     def __init__(self, lobby_id: str, host_player_id: str):
+        self._state_cache = None
         self.lobby_id = lobby_id
         self.host_player_id = host_player_id
         self.players: Dict[str, Player] = {}
@@ -78,6 +101,8 @@ class Lobby:
             return False
         
         self.players[player.player_id] = player
+        self._state_cache = None
+        player.current_lobby = self
         player.current_lobby_id = self.lobby_id
         return True
     
@@ -87,7 +112,10 @@ class Lobby:
         if player_id in self.players:
             player = self.players[player_id]
             player.current_lobby_id = None
+            if player.current_lobby is self:
+                player.current_lobby = None
             del self.players[player_id]
+            self._state_cache = None
             
             # If host leaves, assign new host
             if player_id == self.host_player_id and self.players:
@@ -111,43 +139,95 @@ class Lobby:
         # Return a game session ID (will be created by GameManager)
         return f"game_{self.lobby_id}_{int(datetime.now().timestamp())}"
     
-    @debug_method
+    def __setattr__(self, name, value):
+        if name in Lobby._STATE_FIELDS:
+            object.__setattr__(self, '_state_cache', None)
+        object.__setattr__(self, name, value)
+    
     def get_lobby_state(self) -> dict:
-        """Get current lobby state for clients."""
-        return {
-            'lobby_id': self.lobby_id,
-            'host_player_id': self.host_player_id,
-            'players': [player.to_dict() for player in self.players.values()],
-            'max_players': self.max_players,
-            'game_settings': self.game_settings,
-            'status': self.status,
-            'can_start': self.can_start_game()
-        }
+        """Get current lobby state for clients (cached until the lobby or one of its players changes)."""
+        if self._state_cache is None:
+            self._state_cache = {
+                'lobby_id': self.lobby_id,
+                'host_player_id': self.host_player_id,
+                'players': [player.to_dict() for player in self.players.values()],
+                'max_players': self.max_players,
+                'game_settings': self.game_settings,
+                'status': self.status,
+                'can_start': self.can_start_game()
+            }
+        return self._state_cache
 
 
 class GameSession:
     """Represents an active game session."""
     
+    # Public state fields that can change with every move; small enough to broadcast each turn
     @debug_method
     def __init__(self, session_id: str, board_size: int = 3):
         self.session_id = session_id
         self.board_size = board_size
+        self.total_cells = board_size * board_size
         self.board = None  # Lazy initialization
         self.clues = None  # Lazy initialization
+        self._clue_index_by_sig: Dict[tuple, int] = {}  # clue signature -> index in self.clues
+        self._clues_by_position: Dict[tuple, List[int]] = {}  # cell -> indices of clues that state a fact about it
+        self.connected_sids: Dict[str, str] = {}  # player_id -> sid, for players currently connected
         self.players: Dict[str, Player] = {}
         self.game_state = "waiting"  # waiting, playing, finished
         self.current_turn = None
+        self._turn_order: List[str] = []  # player ids in join order; turns rotate through it
+        self._turn_index = 0  # position of current_turn in _turn_order
         self.turn_count = 0
         self.max_turns = 50  # Shared turn pool - adjust difficulty here
         self.player_turns: Dict[str, int] = {}  # player_id -> turn count
         self.solved_cells: Dict[tuple, dict] = {}  # (r,c) -> {"player_id": str, "solution": Cell}
-        self.revealed_clues: Dict[str, list] = {}  # player_id -> list of clue indices
-        self.shared_clues: Dict[str, list] = {}  # player_id -> list of clues shared with them
+        self._fully_solved_count = 0  # solved_cells entries with both shape and number revealed
+        self.revealed_clues: Dict[str, set] = {}  # player_id -> set of clue indices
+        self.shared_clues: Dict[str, set] = {}  # player_id -> set of clues shared with them
+        self._clue_lists: Dict[str, list] = {}  # player_id -> clue dicts in index order; dropped when their clues change
         self.created_at = datetime.now()
         self.game_start_time = None  # When the game actually starts
+        self._game_start_monotonic = None  # time.monotonic() at start, for the countdown
         self.game_duration = 900  # 15 minutes in seconds
         self.clues_distributed = False  # Track if clues have been distributed
         self._initialization_lock = threading.Lock()  # Thread safety for initialization
+        self._initialized = False  # Set once both the board and its clues exist
+        self.ready = threading.Event()  # Set once the board is generated and clues are distributed
+        self._state_rev = 0  # Bumped on every change that affects player game states
+        self._state_cache: Dict[str, tuple] = {}  # player_id -> ((rev, time_remaining), state)
+        self._last_sent: Dict[str, dict] = {}  # player_id -> private part last broadcast to them
+        self._public_state: tuple = (None, None)  # ((rev, time_remaining), state shared by all players)
+    
+    @property
+    def state_rev(self) -> int:
+        """Revision of the game state; changes whenever any player's state may have changed."""
+        return self._state_rev
+    
+    @property
+    def state_key(self) -> tuple:
+        """(state revision, whole seconds remaining); a player's state is unchanged while this is."""
+        return (self._state_rev, self.get_time_remaining())
+    
+    def bump_state_rev(self):
+        """Mark the game state as changed so cached player states are rebuilt."""
+        self._state_rev += 1
+    
+    @property
+    def connected_count(self) -> int:
+        """Number of players in this game that are currently connected."""
+        return len(self.connected_sids)
+    
+    def _mark_connected(self, player: Player):
+        """Record the sid of a player that connected (or moved to a new sid)."""
+        if self.connected_sids.get(player.player_id) != player.websocket:
+            self.connected_sids[player.player_id] = player.websocket
+            self.bump_state_rev()
+    
+    def _mark_disconnected(self, player: Player):
+        """Drop a player that disconnected from the connected sids."""
+        if self.connected_sids.pop(player.player_id, None) is not None:
+            self.bump_state_rev()
     
     @debug_method
     def add_player(self, player: Player) -> bool:
@@ -156,36 +236,56 @@ class GameSession:
             return False
         
         self.players[player.player_id] = player
+        self._turn_order.append(player.player_id)
         player.current_game_id = self.session_id
-        self.revealed_clues[player.player_id] = []
-        self.shared_clues[player.player_id] = []
+        player.current_game = self
+        if player.connected:
+            self.connected_sids[player.player_id] = player.websocket
+        self.bump_state_rev()
+        self.revealed_clues[player.player_id] = set()
+        self.shared_clues[player.player_id] = set()
+        self._clue_lists.pop(player.player_id, None)
         self.player_turns[player.player_id] = 0
         
         # If this is the first player, they become the current turn
         if self.current_turn is None:
             self.current_turn = player.player_id
+            self._turn_index = len(self._turn_order) - 1
         
         return True
     
-    @debug_method
     def _initialize_board_and_clues(self):
-        """Lazy initialization of board and clues with thread safety."""
-        if self.board is None:
-            with self._initialization_lock:
-                # Double-check pattern to prevent race conditions
-                if self.board is None:
-                    import time
-                    board_start_time = time.time()
-                    print(f"[TIMING] About to create board at: {board_start_time:.3f}s")
-                    self.board = Board(self.board_size)
-                    board_time = time.time()
-                    print(f"[TIMING] Board created at: {board_time:.3f}s (took {board_time - board_start_time:.3f}s)")
-                    
-                    print(f"[TIMING] About to generate clues at: {time.time():.3f}s")
-                    self.clues = self.board.generate_all_clues()
-                    clues_time = time.time()
-                    print(f"[TIMING] Clues generated at: {clues_time:.3f}s (took {clues_time - board_time:.3f}s)")
-                    print(f"[TIMING] Total board+clues initialization: {clues_time - board_start_time:.3f}s")
+        """Lazy initialization of board and clues with thread safety; a no-op once done."""
+        if self._initialized:
+            return
+        with self._initialization_lock:
+            # Double-check pattern to prevent race conditions
+            if not self._initialized:
+                # Build everything in locals and publish it in one go, so no
+                # reader sees a board without its clues or a half-built index
+                with Timed(logger, 'board creation'):
+                    board = Board(self.board_size)
+                
+                with Timed(logger, 'clue generation'):
+                    clues = board.generate_all_clues()
+                    index_by_sig: Dict[tuple, int] = {}
+                    by_position: Dict[tuple, List[int]] = {}
+                    for i, clue in enumerate(clues):
+                        index_by_sig.setdefault(clue.signature(), i)
+                        if clue.clue_type is ClueType.CONDITIONAL:
+                            positions = {clue.condition.position, clue.consequence.position}
+                        else:
+                            positions = {clue.position}  # None for general clues
+                        for position in positions:
+                            if position is not None:
+                                by_position.setdefault(position, []).append(i)
+                
+                self.clues = clues
+                self._clue_index_by_sig = index_by_sig
+                self._clues_by_position = by_position
+                self.board = board
+                self.bump_state_rev()
+                self._initialized = True
     
     @debug_method
     def start_game(self) -> bool:
@@ -200,9 +300,21 @@ class GameSession:
         self.distribute_clues()
         
         self.game_state = "playing"
-        self.game_start_time = datetime.now()
+        self.mark_started()
         return True
     
+    def mark_started(self):
+        """Record the start of play; the wall-clock time is kept for display and cleanup."""
+        self.game_start_time = datetime.now()
+        self._game_start_monotonic = time.monotonic()
+    
+    @debug_method
+    def prepare(self):
+        """Generate the board and hand out clues, then mark the game as ready."""
+        self._initialize_board_and_clues()
+        self.distribute_clues()
+        self.ready.set()
+    
     @debug_method
     def distribute_clues(self):
         """Distribute clues uniquely among players at game start."""
@@ -224,28 +336,32 @@ class GameSession:
             total_clues = len(self.clues)
             clues_per_player = max(6, total_clues // num_players)
             
-            print(f"DEBUG: Distributing {total_clues} total clues among {num_players} players ({clues_per_player} each)")
+            logger.debug("Distributing %s total clues among %s players (%s each)", total_clues, num_players, clues_per_player)
             
             # Shuffle all clue indices
             all_clue_indices = list(range(total_clues))
             random.shuffle(all_clue_indices)
             
-            # Distribute clues to each player
+            # Distribute clues to each player, staged locally and published at the end
+            revealed = dict(self.revealed_clues)
             player_ids = list(self.players.keys())
             for i, player_id in enumerate(player_ids):
                 start_idx = i * clues_per_player
                 end_idx = min(start_idx + clues_per_player, total_clues)
                 
                 # Give this player their clues
-                self.revealed_clues[player_id] = all_clue_indices[start_idx:end_idx]
-                print(f"DEBUG: Player {i+1} gets {len(self.revealed_clues[player_id])} clues")
+                revealed[player_id] = set(all_clue_indices[start_idx:end_idx])
+                logger.debug("Player %s gets %s clues", i+1, len(revealed[player_id]))
                 
                 # If this is the last player and there are remaining clues, give them the extras
                 if i == len(player_ids) - 1 and end_idx < total_clues:
-                    self.revealed_clues[player_id].extend(all_clue_indices[end_idx:])
-                    print(f"DEBUG: Player {i+1} gets {len(all_clue_indices[end_idx:])} extra clues")
+                    revealed[player_id].update(all_clue_indices[end_idx:])
+                    logger.debug("Player %s gets %s extra clues", i+1, len(all_clue_indices[end_idx:]))
             
+            self.revealed_clues = revealed
+            self._clue_lists = {}
             self.clues_distributed = True
+            self.bump_state_rev()
     
     @debug_method
     def _remove_redundant_clues(self, row: int, col: int, shape: str, number: int):
@@ -253,75 +369,53 @@ class GameSession:
         if not self.clues:
             return
         
-        # Find clues that are now redundant
-        redundant_clue_indices = []
-        
-        for i, clue in enumerate(self.clues):
-            is_redundant = False
-            
-            if clue.clue_type.value == 1:  # EXPLICIT
-                # If this clue is about the exact cell that was just solved
-                if clue.position == (row, col):
-                    if clue.attribute == "shape" and clue.value == shape:
-                        is_redundant = True
-                    elif clue.attribute == "number" and clue.value == number:
-                        is_redundant = True
-            
-            elif clue.clue_type.value == 2:  # GENERAL
-                # For general clues, we need to check if this cell's reveal makes the clue redundant
-                # This is more complex - for now, we'll be conservative and not remove general clues
-                # as they might still be useful for other cells
-                pass
-            
-            elif clue.clue_type.value == 3:  # CONDITIONAL
-                # Check if the condition or consequence is about the solved cell
-                if clue.condition and clue.condition.position == (row, col):
-                    if clue.condition.attribute == "shape" and clue.condition.value == shape:
-                        is_redundant = True
-                    elif clue.condition.attribute == "number" and clue.condition.value == number:
-                        is_redundant = True
-                
-                if clue.consequence and clue.consequence.position == (row, col):
-                    if clue.consequence.attribute == "shape" and clue.consequence.value == shape:
-                        is_redundant = True
-                    elif clue.consequence.attribute == "number" and clue.consequence.value == number:
-                        is_redundant = True
-            
+        # Only clues with a fact about this cell can become redundant; general
+        # clues are kept as they might still be useful for other cells
+        def fact_revealed(fact) -> bool:
+            return (fact is not None and fact.position == (row, col) and
+                    ((fact.attribute == "shape" and fact.value == shape) or
+                     (fact.attribute == "number" and fact.value == number)))
+        
+        redundant_clue_indices = set()
+        for i in self._clues_by_position.get((row, col), ()):
+            clue = self.clues[i]
+            if clue.clue_type is ClueType.EXPLICIT:
+                is_redundant = fact_revealed(clue)
+            else:
+                is_redundant = fact_revealed(clue.condition) or fact_revealed(clue.consequence)
             if is_redundant:
-                redundant_clue_indices.append(i)
+                redundant_clue_indices.add(i)
+        
+        if not redundant_clue_indices:
+            return
         
         # Remove redundant clues from all players
         for player_id in self.players:
-            # Remove from revealed clues
-            self.revealed_clues[player_id] = [
-                idx for idx in self.revealed_clues[player_id] 
-                if idx not in redundant_clue_indices
-            ]
-            # Remove from shared clues
-            self.shared_clues[player_id] = [
-                idx for idx in self.shared_clues[player_id] 
-                if idx not in redundant_clue_indices
-            ]
+            revealed, shared = self.revealed_clues[player_id], self.shared_clues[player_id]
+            if not (revealed.isdisjoint(redundant_clue_indices) and shared.isdisjoint(redundant_clue_indices)):
+                revealed -= redundant_clue_indices
+                shared -= redundant_clue_indices
+                self._clue_lists.pop(player_id, None)
     
     @debug_method
     def submit_solution(self, player_id: str, position: tuple, guess: dict) -> dict:
         """Submit a solution for a cell position."""
-        print(f"[DEBUG] submit_solution called - game_state: {self.game_state}, player_id: {player_id}, current_turn: {self.current_turn}")
+        logger.debug("submit_solution called - game_state: %s, player_id: %s, current_turn: %s", self.game_state, player_id, self.current_turn)
         
         if self.game_state != "playing":
-            print(f"[DEBUG] Game not in playing state: {self.game_state}")
+            logger.debug("Game not in playing state: %s", self.game_state)
             # TEMPORARY FIX: Allow submission even when game_state is "finished" for debugging
             if self.game_state == "finished":
-                print(f"[DEBUG] Allowing submission despite finished state for debugging")
+                logger.debug("Allowing submission despite finished state for debugging")
             else:
                 return {"success": False, "error": "Game not in playing state"}
         
         if player_id not in self.players:
-            print(f"[DEBUG] Player not in game: {player_id}")
+            logger.debug("Player not in game: %s", player_id)
             return {"success": False, "error": "Player not in game"}
         
         if player_id != self.current_turn:
-            print(f"[DEBUG] Not player's turn: {player_id} != {self.current_turn}")
+            logger.debug("Not player's turn: %s != %s", player_id, self.current_turn)
             return {"success": False, "error": "Not your turn"}
         
         # Ensure board and clues are initialized
@@ -331,12 +425,12 @@ class GameSession:
         # Check if cell is fully solved (both shape and number revealed)
         if (r, c) in self.solved_cells:
             existing = self.solved_cells[(r, c)]
-            print(f"[DEBUG] Cell ({r}, {c}) already in solved_cells: shape_revealed={existing['revealed']['shape']}, number_revealed={existing['revealed']['number']}")
+            logger.debug("Cell (%s, %s) already in solved_cells: shape_revealed=%s, number_revealed=%s", r, c, existing['revealed']['shape'], existing['revealed']['number'])
             if existing["revealed"]["shape"] and existing["revealed"]["number"]:
-                print(f"[DEBUG] Cell ({r}, {c}) is fully solved, rejecting guess")
+                logger.debug("Cell (%s, %s) is fully solved, rejecting guess", r, c)
                 return {"success": False, "error": "Cell already fully solved"}
             else:
-                print(f"[DEBUG] Cell ({r}, {c}) is partially solved, allowing update")
+                logger.debug("Cell (%s, %s) is partially solved, allowing update", r, c)
         
         # Validate the guess
         actual_cell = self.board.board[r][c]
@@ -349,6 +443,7 @@ class GameSession:
         
         # Check if solution is correct
         success = False
+        solved_at = datetime.now().isoformat()  # one timestamp for whichever entry this guess writes
         
         if shape_correct and number_correct:
             # Both correct (or both not guessed)
@@ -365,18 +460,24 @@ class GameSession:
                         "shape": True,
                         "number": True
                     },
-                    "solved_at": datetime.now().isoformat()
+                    "solved_at": solved_at
                 }
             else:
                 # Partial guess, both parts correct
                 success = True
                 # Update existing entry or create new one
                 if (r, c) in self.solved_cells:
-                    # Update existing partial solution
+                    # Update existing partial solution; replaced rather than mutated so
+                    # states already built (and recorded as sent) keep the old entry
                     existing = self.solved_cells[(r, c)]
-                    existing["revealed"]["shape"] = existing["revealed"]["shape"] or (guessed_shape is not None)
-                    existing["revealed"]["number"] = existing["revealed"]["number"] or (guessed_number is not None)
-                    existing["solved_at"] = datetime.now().isoformat()
+                    self.solved_cells[(r, c)] = {
+                        **existing,
+                        "revealed": {
+                            "shape": existing["revealed"]["shape"] or (guessed_shape is not None),
+                            "number": existing["revealed"]["number"] or (guessed_number is not None)
+                        },
+                        "solved_at": solved_at
+                    }
                 else:
                     # Create new partial solution
                     self.solved_cells[(r, c)] = {
@@ -389,63 +490,68 @@ class GameSession:
                             "shape": guessed_shape is not None,
                             "number": guessed_number is not None
                         },
-                        "solved_at": datetime.now().isoformat()
+                        "solved_at": solved_at
                     }
         
         # Remove redundant clues if cell was solved
         if success:
+            # Fully solved cells were rejected above, so a full reveal now is a new one
+            revealed = self.solved_cells[(r, c)]["revealed"]
+            if revealed["shape"] and revealed["number"]:
+                self._fully_solved_count += 1
             self._remove_redundant_clues(r, c, actual_cell.shape, actual_cell.number)
         
         # Move to next turn
-        print(f"[DEBUG] About to call next_turn() - success: {success}")
+        logger.debug("About to call next_turn() - success: %s", success)
         self.next_turn()
-        print(f"[DEBUG] After next_turn() - current_turn: {self.current_turn}")
+        logger.debug("After next_turn() - current_turn: %s", self.current_turn)
         
         # Calculate game metrics (needed for return values)
-        total_cells = self.board.size * self.board.size
+        total_cells = self.total_cells
         # Count only fully solved cells (both shape and number revealed)
-        cells_solved = sum(1 for cell_data in self.solved_cells.values() 
-                          if cell_data["revealed"]["shape"] and cell_data["revealed"]["number"])
+        cells_solved = self._fully_solved_count
         turns_remaining = self.max_turns - self.turn_count
         time_remaining = self.get_time_remaining()
         
-        print(f"[DEBUG] Game metrics calculated:")
-        print(f"  - max_turns: {self.max_turns}")
-        print(f"  - turn_count: {self.turn_count}")
-        print(f"  - turns_remaining: {turns_remaining}")
-        print(f"  - total_cells: {total_cells}")
-        print(f"  - cells_solved (fully): {cells_solved}")
-        print(f"  - total_solved_cells (partial+full): {len(self.solved_cells)}")
-        print(f"  - time_remaining: {time_remaining}")
+        logger.debug("Game metrics calculated: max_turns: %s, turn_count: %s, turns_remaining: %s, total_cells: %s, cells_solved (fully): %s, total_solved_cells (partial+full): %s, time_remaining: %s",
+            self.max_turns,
+            self.turn_count,
+            turns_remaining,
+            total_cells,
+            cells_solved,
+            len(self.solved_cells),
+            time_remaining)
         
         # Check if game is complete (all cells solved, turns exhausted, or time up)
         # Only check if game is still in playing state
         if self.game_state == "playing":
-            print(f"[DEBUG] Game completion check:")
-            print(f"  - total_cells: {total_cells}")
-            print(f"  - cells_solved: {cells_solved}")
-            print(f"  - turns_remaining: {turns_remaining}")
-            print(f"  - time_remaining: {time_remaining}")
-            print(f"  - current game_state: {self.game_state}")
-            print(f"  - turn_count: {self.turn_count}")
-            print(f"  - max_turns: {self.max_turns}")
-            print(f"  - game_start_time: {self.game_start_time}")
-            print(f"  - solved_cells count: {len(self.solved_cells)}")
-            print(f"  - board size: {self.board.size if self.board else 'None'}")
+            logger.debug("Game completion check: total_cells: %s, cells_solved: %s, turns_remaining: %s, time_remaining: %s, current game_state: %s, turn_count: %s, max_turns: %s, game_start_time: %s, solved_cells count: %s, board size: %s",
+                total_cells,
+                cells_solved,
+                turns_remaining,
+                time_remaining,
+                self.game_state,
+                self.turn_count,
+                self.max_turns,
+                self.game_start_time,
+                len(self.solved_cells),
+                self.board.size if self.board else 'None')
             
             if cells_solved >= total_cells:
-                print(f"[DEBUG] Game finished: All cells solved ({cells_solved}/{total_cells})")
+                logger.debug("Game finished: All cells solved (%s/%s)", cells_solved, total_cells)
                 self.game_state = "finished"
             elif turns_remaining <= 0:
-                print(f"[DEBUG] Game finished: No turns remaining ({turns_remaining})")
+                logger.debug("Game finished: No turns remaining (%s)", turns_remaining)
                 self.game_state = "finished"
             elif time_remaining <= 0:
-                print(f"[DEBUG] Game finished: Time up ({time_remaining})")
+                logger.debug("Game finished: Time up (%s)", time_remaining)
                 self.game_state = "finished"
             else:
-                print(f"[DEBUG] Game continues - not finished yet")
+                logger.debug("Game continues - not finished yet")
         else:
-            print(f"[DEBUG] Skipping game completion check - game state is: {self.game_state}")
+            logger.debug("Skipping game completion check - game state is: %s", self.game_state)
+        
+        self.bump_state_rev()
         
         if success:
             return {
@@ -468,37 +574,48 @@ class GameSession:
             }
     
     
-    @debug_method
     def get_time_remaining(self) -> int:
         """Get remaining time in seconds."""
-        if not self.game_start_time or self.game_state != "playing":
+        if self._game_start_monotonic is None or self.game_state != "playing":
             return self.game_duration
         
-        elapsed = (datetime.now() - self.game_start_time).total_seconds()
-        remaining = max(0, self.game_duration - elapsed)
-        return int(remaining)
+        elapsed = time.monotonic() - self._game_start_monotonic
+        return int(max(0, self.game_duration - elapsed))
     
-    @debug_method
     def next_turn(self):
         """Move to the next player's turn."""
-        print(f"[DEBUG] next_turn called - current_turn: {self.current_turn}, players: {list(self.players.keys())}")
+        logger.debug("next_turn called - current_turn: %s, players: %s", self.current_turn, self._turn_order)
         
-        if not self.players:
-            print(f"[DEBUG] No players, returning")
+        if not self._turn_order:
+            logger.debug("No players, returning")
             return
         
-        player_ids = list(self.players.keys())
-        current_index = player_ids.index(self.current_turn) if self.current_turn in player_ids else 0
-        next_index = (current_index + 1) % len(player_ids)
+        turn_order = self._turn_order
+        # current_turn may have been assigned directly; only then search for it
+        if turn_order[self._turn_index] != self.current_turn:
+            self._turn_index = turn_order.index(self.current_turn) if self.current_turn in self.players else 0
+        self._turn_index = (self._turn_index + 1) % len(turn_order)
         old_turn = self.current_turn
-        self.current_turn = player_ids[next_index]
+        self.current_turn = turn_order[self._turn_index]
         
         # Increment turn count only when a turn is actually completed
         # This represents the number of completed turns, not the current turn number
         self.turn_count += 1
         self.player_turns[self.current_turn] += 1
+        self.bump_state_rev()
         
-        print(f"[DEBUG] Turn advanced: {old_turn} -> {self.current_turn}, turn_count: {self.turn_count}")
+        logger.debug("Turn advanced: %s -> %s, turn_count: %s", old_turn, self.current_turn, self.turn_count)
+    
+    def find_clue_index(self, clue_data: dict) -> Optional[int]:
+        """Find the index of a clue from its client-side dict representation."""
+        signature = Clue.signature_from_dict(clue_data)
+        if signature is None:
+            return None
+        try:
+            return self._clue_index_by_sig.get(signature)
+        except TypeError:
+            # Client sent a list/dict where a scalar was expected; it can't match any clue
+            return None
     
     @debug_method
     def share_clue(self, from_player_id: str, to_player_id: str, clue_index: int) -> dict:
@@ -533,16 +650,19 @@ class GameSession:
         
         # Share the clue
         # Add to receiver's shared clues (they keep their original clues)
-        self.shared_clues[to_player_id].append(clue_index)
+        self.shared_clues[to_player_id].add(clue_index)
         
         # Remove the clue from the sender's revealed clues (they no longer have it)
         if clue_index in self.revealed_clues[from_player_id]:
-            self.revealed_clues[from_player_id].remove(clue_index)
+            self.revealed_clues[from_player_id].discard(clue_index)
         elif clue_index in self.shared_clues[from_player_id]:
-            self.shared_clues[from_player_id].remove(clue_index)
+            self.shared_clues[from_player_id].discard(clue_index)
+        self._clue_lists.pop(from_player_id, None)
+        self._clue_lists.pop(to_player_id, None)
         
         # Move to next turn
         self.next_turn()
+        self.bump_state_rev()
         
         return {
             "success": True,
@@ -551,25 +671,15 @@ class GameSession:
             "to_player": self.players[to_player_id].name
         }
     
-    @debug_method
-    def get_game_state_for_player(self, player_id: str) -> dict:
-        """Get game state for a specific player."""
-        import time
-        state_start_time = time.time()
-        print(f"[TIMING] get_game_state_for_player called at: {state_start_time:.3f}s")
-        
+    def _prepare_state(self):
+        """Make sure the board, clues and turn bookkeeping exist before building a state."""
         # Ensure board and clues are initialized when first accessed
-        print(f"[TIMING] About to initialize board and clues at: {time.time():.3f}s")
         self._initialize_board_and_clues()
-        init_time = time.time()
-        print(f"[TIMING] Board and clues initialized at: {init_time:.3f}s (took {init_time - state_start_time:.3f}s)")
         
         # If clues haven't been distributed yet, do it now
         if not self.clues_distributed:
-            print(f"[TIMING] About to distribute clues at: {time.time():.3f}s")
-            self.distribute_clues()
-            distribute_time = time.time()
-            print(f"[TIMING] Clues distributed at: {distribute_time:.3f}s (took {distribute_time - init_time:.3f}s)")
+            with Timed(logger, 'clue distribution'):
+                self.distribute_clues()
         
         # Initialize player turns if not done yet
         for p_id in self.players:
@@ -578,68 +688,136 @@ class GameSession:
         
         # Ensure current_turn is set if not already set
         if self.current_turn is None and self.players:
-            self.current_turn = list(self.players.keys())[0]
-            print(f"[DEBUG] Set current_turn to first player: {self.current_turn}")
-        
-        # Get all clues available to this player (revealed + shared)
-        print(f"[TIMING] About to process clues at: {time.time():.3f}s")
-        all_clue_indices = set(self.revealed_clues.get(player_id, []))
-        all_clue_indices.update(self.shared_clues.get(player_id, []))
-        player_clues = [self.clues[i].to_dict() for i in sorted(all_clue_indices)]
-        clues_time = time.time()
-        print(f"[TIMING] Clues processed at: {clues_time:.3f}s (took {clues_time - state_start_time:.3f}s)")
-        
-        solved_cells_dict = {f"{r},{c}": data for (r, c), data in self.solved_cells.items()}
-        
-        # Pre-compute player data to avoid multiple to_dict() calls
-        players_data = [p.to_dict() for p in self.players.values()]
-        
-        # Calculate collaborative metrics
-        total_cells = self.board.size * self.board.size
-        # Count only fully solved cells (both shape and number revealed)
-        cells_solved = sum(1 for cell_data in self.solved_cells.values() 
-                          if cell_data["revealed"]["shape"] and cell_data["revealed"]["number"])
-        cells_remaining = total_cells - cells_solved
-        turns_remaining = self.max_turns - self.turn_count
+            self.current_turn = self._turn_order[0]
+            self._turn_index = 0
+            logger.debug("Set current_turn to first player: %s", self.current_turn)
+    
+    def get_public_state(self) -> dict:
+        """
+        Get the part of the game state that is the same for every player.
+        
+        Built once per state revision and remaining second, so it can be
+        broadcast to the whole game room as a single payload.
+        """
+        self._prepare_state()
         time_remaining = self.get_time_remaining()
+        key = (self._state_rev, time_remaining)
+        if self._public_state[0] == key:
+            return self._public_state[1]
         
-        # Calculate is_my_turn
-        is_my_turn = self.current_turn == player_id
+        solved_cells_dict = {f"{r},{c}": data for (r, c), data in self.solved_cells.items()}
         
-        result = {
+        public_state = {
+            **self._progress(time_remaining),
             'session_id': self.session_id,
+            'board_size': self.board_size,
+            'players': [p.to_dict() for p in self.players.values()],
+            'max_turns': self.max_turns,
+            'total_cells': self.total_cells,
+            'solved_cells': solved_cells_dict
+        }
+        self._public_state = (key, public_state)
+        return public_state
+    
+    def _progress(self, time_remaining: int) -> dict:
+        """Turn and progress counters; cheap enough to build without the rest of the public state."""
+        # Count only fully solved cells (both shape and number revealed)
+        cells_solved = self._fully_solved_count
+        return {
+            'rev': self._state_rev,
             'game_state': self.game_state,
-            'board_size': self.board.size,
-            'players': players_data,
             'current_turn': self.current_turn,
             'turn_count': self.turn_count,
-            'max_turns': self.max_turns,
-            'turns_remaining': turns_remaining,
+            'turns_remaining': self.max_turns - self.turn_count,
             'time_remaining': time_remaining,
             'cells_solved': cells_solved,
-            'cells_remaining': cells_remaining,
-            'total_cells': total_cells,
+            'cells_remaining': self.total_cells - cells_solved,
+            'cells_revealed': len(self.solved_cells)  # cells with at least one attribute revealed
+        }
+    
+    def get_progress_state(self) -> dict:
+        """Get the turn and progress counters of the public state."""
+        self._prepare_state()
+        return self._progress(self.get_time_remaining())
+    
+    def get_private_state(self, player_id: str) -> dict:
+        """Get the part of the game state that only this player sees."""
+        self._prepare_state()
+        
+        # All clues available to this player (revealed + shared), sorted only
+        # when their clues have changed since the last build
+        clues = self._clue_lists.get(player_id)
+        if clues is None:
+            all_clue_indices = self.revealed_clues.get(player_id, set()) | self.shared_clues.get(player_id, set())
+            clues = self._clue_lists[player_id] = [self.clues[i].to_dict() for i in sorted(all_clue_indices)]
+        
+        return {
+            'rev': self._state_rev,
             'player_turns': self.player_turns.get(player_id, 0),
-            'solved_cells': solved_cells_dict,
-            'clues': player_clues,
-            'is_my_turn': is_my_turn
+            'clues': clues,
+            'is_my_turn': self.current_turn == player_id
         }
+    
+    def get_game_state_for_player(self, player_id: str) -> dict:
+        """Get game state for a specific player."""
+        result = {**self.get_public_state(), **self.get_private_state(player_id)}
         
         # Debug logging for turn information
-        print(f"[DEBUG] Game state for player {player_id}:")
-        print(f"  - current_turn: {self.current_turn}")
-        print(f"  - is_my_turn: {is_my_turn}")
-        print(f"  - game_state: {self.game_state}")
-        print(f"  - players: {[p.player_id for p in self.players.values()]}")
-        print(f"  - turn_count: {self.turn_count}")
-        print(f"  - max_turns: {self.max_turns}")
-        print(f"  - cells_solved: {len(self.solved_cells)}")
-        print(f"  - total_cells: {total_cells}")
-        print(f"  - time_remaining: {time_remaining}")
-        
-        final_time = time.time()
-        print(f"[TIMING] get_game_state_for_player completed at: {final_time:.3f}s (total time: {final_time - state_start_time:.3f}s)")
+        logger.debug("Game state for player %s: current_turn: %s, is_my_turn: %s, game_state: %s, players: %s, turn_count: %s, max_turns: %s, cells_solved: %s, total_cells: %s, time_remaining: %s",
+            player_id,
+            self.current_turn,
+            result['is_my_turn'],
+            self.game_state,
+            [p.player_id for p in self.players.values()],
+            self.turn_count,
+            self.max_turns,
+            result['cells_solved'],
+            result['total_cells'],
+            result['time_remaining'])
+        
         return result
+    
+    def get_changed_private_states(self, player_ids) -> Dict[str, dict]:
+        """
+        Get the private parts that changed since they were last broadcast to each player.
+        
+        Only the returned parts are recorded as sent, so callers must emit all
+        of them; players whose private part is unchanged are left out.
+        """
+        private_states = {}
+        for player_id in player_ids:
+            private_state = self.get_private_state(player_id)
+            base = self._last_sent.get(player_id)
+            if base is None or any(base.get(key) != value for key, value in private_state.items() if key != 'rev'):
+                private_states[player_id] = private_state
+                self._last_sent[player_id] = private_state
+        return private_states
+    
+    def get_game_state_cached(self, player_id: str) -> dict:
+        """
+        Get game state for a player, reusing the last result until the state changes.
+        
+        Entries are keyed on the state revision and the remaining time in whole
+        seconds, so a broadcast builds each player's state once and the timer
+        in a cached state is never more than a second out of date.
+        """
+        cached = self._state_cache.get(player_id)
+        if cached is not None and cached[0] == self.state_key:
+            return cached[1]
+        
+        state = self.get_game_state_for_player(player_id)
+        self._state_cache[player_id] = ((self._state_rev, state['time_remaining']), state)
+        return state
+    
+    def get_static_state_for_player(self, player_id: str) -> dict:
+        """Get the parts of the game state that never change once the game has started."""
+        self._initialize_board_and_clues()
+        return {
+            'session_id': self.session_id,
+            'board_size': self.board_size,
+            'max_turns': self.max_turns,
+            'total_cells': self.total_cells
+        }
 
 
 class GameManager:
@@ -650,7 +828,11 @@ class GameManager:
         self.lobbies: Dict[str, Lobby] = {}
         self.game_sessions: Dict[str, GameSession] = {}
         self.players: Dict[str, Player] = {}
+        self.sid_to_player_id: Dict[str, str] = {}  # Socket.IO sid -> player_id
         self._cleanup_lock = threading.Lock()  # Thread safety for cleanup
+        # lobby_id -> lock held across check-then-act sequences on that lobby; created
+        # with the lobby and dropped (while held) when the lobby is removed
+        self._lobby_locks: Dict[str, threading.Lock] = {}
     
     @debug_method
     def create_player(self, player_id: str = None, name: str = None) -> Player:
@@ -664,6 +846,35 @@ class GameManager:
         """Get a player by ID."""
         return self.players.get(player_id)
     
+    @debug_method
+    def connect_player(self, player: Player, sid: str):
+        """Connect a player to a socket sid and index the sid for disconnect lookups."""
+        if player.websocket and self.sid_to_player_id.get(player.websocket) == player.player_id:
+            del self.sid_to_player_id[player.websocket]
+        player.connect(sid)
+        self.sid_to_player_id[sid] = player.player_id
+        game = player.current_game
+        if game and player.player_id in game.players:
+            game._mark_connected(player)
+    
+    @debug_method
+    def disconnect_player(self, player: Player):
+        """Disconnect a player and drop them from their game's connected sids."""
+        if not player.connected:
+            return
+        player.disconnect()
+        game = player.current_game
+        if game and player.player_id in game.players:
+            game._mark_disconnected(player)
+    
+    @debug_method
+    def pop_player_by_sid(self, sid: str) -> Optional[Player]:
+        """Remove a sid from the index and return the player it belonged to."""
+        player_id = self.sid_to_player_id.pop(sid, None)
+        if player_id is None:
+            return None
+        return self.players.get(player_id)
+    
     @debug_method
     def create_lobby(self, host_player_id: str) -> Optional[str]:
         """Create a new lobby."""
@@ -677,79 +888,101 @@ class GameManager:
         host = self.players[host_player_id]
         lobby.add_player(host)
         
+        self._lobby_locks[lobby_id] = threading.Lock()
         self.lobbies[lobby_id] = lobby
         return lobby_id
     
     @debug_method
     def join_lobby(self, lobby_id: str, player_id: str) -> bool:
         """Join a player to a lobby."""
-        if lobby_id not in self.lobbies or player_id not in self.players:
+        lock = self._lobby_locks.get(lobby_id)
+        if lock is None:
             return False
-        
-        lobby = self.lobbies[lobby_id]
-        player = self.players[player_id]
-        
-        return lobby.add_player(player)
+        with lock:
+            if lobby_id not in self.lobbies or player_id not in self.players:
+                return False
+            
+            lobby = self.lobbies[lobby_id]
+            player = self.players[player_id]
+            
+            return lobby.add_player(player)
     
     @debug_method
     def leave_lobby(self, lobby_id: str, player_id: str) -> bool:
         """Remove a player from a lobby."""
-        if lobby_id not in self.lobbies:
+        lock = self._lobby_locks.get(lobby_id)
+        if lock is None:
             return False
-        
-        lobby = self.lobbies[lobby_id]
-        success = lobby.remove_player(player_id)
-        
-        # Clean up empty lobbies
-        if not lobby.players:
-            del self.lobbies[lobby_id]
-        
-        return success
+        with lock:
+            if lobby_id not in self.lobbies:
+                return False
+            
+            lobby = self.lobbies[lobby_id]
+            success = lobby.remove_player(player_id)
+            
+            # Clean up empty lobbies
+            if not lobby.players:
+                del self.lobbies[lobby_id]
+                self._lobby_locks.pop(lobby_id, None)
+            
+            return success
     
     @debug_method
     def start_game_from_lobby(self, lobby_id: str) -> Optional[str]:
-        """Start a game from a lobby."""
-        print(f"DEBUG: start_game_from_lobby called with lobby_id: {lobby_id}")
-        if lobby_id not in self.lobbies:
-            print(f"DEBUG: Lobby {lobby_id} not found in lobbies")
-            return None
-        
-        lobby = self.lobbies[lobby_id]
-        print(f"DEBUG: Found lobby with {len(lobby.players)} players")
-        game_id = lobby.start_game()
-        print(f"DEBUG: lobby.start_game() returned: {game_id}")
-        
-        if not game_id:
-            print(f"DEBUG: lobby.start_game() returned None")
+        """
+        Start a game from a lobby.
+        
+        The board is not generated here, so callers can run GameSession.prepare()
+        off the request path; the session's ready event is set once it has.
+        Returns None if the game could not be started.
+        """
+        logger.debug("start_game_from_lobby called with lobby_id: %s", lobby_id)
+        lock = self._lobby_locks.get(lobby_id)
+        if lock is None:
+            logger.debug("Lobby %s not found in lobbies", lobby_id)
             return None
-        
-        # Create game session (lazy initialization - no board generation yet)
-        print(f"DEBUG: Creating game session with board size: {lobby.game_settings['board_size']}")
-        game_session = GameSession(game_id, lobby.game_settings["board_size"])
-        
-        # Add all lobby players to game
-        print(f"DEBUG: Adding {len(lobby.players)} players to game session")
-        for player in lobby.players.values():
-            game_session.add_player(player)
-        
-        # Initialize the game (this will set up turn order, etc.)
-        # But board/clues will be generated lazily when first accessed
-        game_session.game_state = "playing"
-        game_session.game_start_time = datetime.now()  # Set start time when game begins
-        game_session.current_turn = list(game_session.players.keys())[0]  # Set first player as current turn
-        print(f"DEBUG: Set current turn to: {game_session.current_turn}")
-        print(f"DEBUG: Set game_state to: {game_session.game_state}")
-        print(f"DEBUG: Game session created with {len(game_session.players)} players")
-        
-        # Store game session
-        self.game_sessions[game_id] = game_session
-        print(f"DEBUG: Stored game session, total games: {len(self.game_sessions)}")
-        
-        # Clean up lobby
-        del self.lobbies[lobby_id]
-        print(f"DEBUG: Cleaned up lobby, returning game_id: {game_id}")
-        
-        return game_id
+        with lock:
+            if lobby_id not in self.lobbies:
+                logger.debug("Lobby %s not found in lobbies", lobby_id)
+                return None
+            
+            lobby = self.lobbies[lobby_id]
+            logger.debug("Found lobby with %s players", len(lobby.players))
+            game_id = lobby.start_game()
+            logger.debug("lobby.start_game() returned: %s", game_id)
+            
+            if not game_id:
+                logger.debug("lobby.start_game() returned None")
+                return None
+            
+            # Create game session (lazy initialization - no board generation yet)
+            logger.debug("Creating game session with board size: %s", lobby.game_settings['board_size'])
+            game_session = GameSession(game_id, lobby.game_settings["board_size"])
+            
+            # Add all lobby players to game
+            logger.debug("Adding %s players to game session", len(lobby.players))
+            for player in lobby.players.values():
+                game_session.add_player(player)
+            
+            # Initialize the game (this will set up turn order, etc.)
+            # But board/clues will be generated lazily when first accessed
+            game_session.game_state = "playing"
+            game_session.mark_started()  # Set start time when game begins
+            game_session.current_turn = game_session._turn_order[0]  # Set first player as current turn
+            logger.debug("Set current turn to: %s", game_session.current_turn)
+            logger.debug("Set game_state to: %s", game_session.game_state)
+            logger.debug("Game session created with %s players", len(game_session.players))
+            
+            # Store game session
+            self.game_sessions[game_id] = game_session
+            logger.debug("Stored game session, total games: %s", len(self.game_sessions))
+            
+            # Clean up lobby
+            del self.lobbies[lobby_id]
+            self._lobby_locks.pop(lobby_id, None)
+            logger.debug("Cleaned up lobby, returning game_id: %s", game_id)
+            
+            return game_id
     
     @debug_method
     def get_lobby_by_id(self, lobby_id: str) -> Optional[Lobby]:
@@ -768,22 +1001,37 @@ class GameManager:
         
         # Clean up old lobbies (older than 1 hour)
         inactive_lobbies = [
-            lobby_id for lobby_id, lobby in self.lobbies.items()
+            lobby_id for lobby_id, lobby in list(self.lobbies.items())
             if (current_time - lobby.created_at).seconds > 3600
         ]
         
         for lobby_id in inactive_lobbies:
-            del self.lobbies[lobby_id]
+            lock = self._lobby_locks.get(lobby_id)
+            if lock is None:
+                continue
+            with lock:
+                # The lobby may have started a game while we waited for its lock
+                if self.lobbies.pop(lobby_id, None) is not None:
+                    self._lobby_locks.pop(lobby_id, None)
         
         # Clean up finished games (older than 30 minutes)
         inactive_games = [
-            game_id for game_id, game in self.game_sessions.items()
+            game_id for game_id, game in list(self.game_sessions.items())
             if game.game_state == "finished" and 
             (current_time - game.created_at).seconds > 1800
         ]
         
         for game_id in inactive_games:
-            del self.game_sessions[game_id]
+            self._remove_game(game_id)
+    
+    def _remove_game(self, game_id: str):
+        """Remove a game session and detach its players from it."""
+        game = self.game_sessions.pop(game_id, None)
+        if game is None:
+            return
+        for player in game.players.values():
+            if player.current_game is game:
+                player.current_game = None
     
     def get_stats(self) -> dict:
         """Get server statistics."""
@@ -800,7 +1048,7 @@ class GameManager:
         with self._cleanup_lock:
             # Clean up finished games
             finished_games = []
-            for game_id, game in self.game_sessions.items():
+            for game_id, game in list(self.game_sessions.items()):
                 if game.game_state == "finished":
                     # Check if game has been finished for more than 1 hour
                     if game.game_start_time:
@@ -809,32 +1057,39 @@ class GameManager:
                             finished_games.append(game_id)
             
             for game_id in finished_games:
-                print(f"[CLEANUP] Removing finished game: {game_id}")
-                del self.game_sessions[game_id]
+                logger.info("[CLEANUP] Removing finished game: %s", game_id)
+                self._remove_game(game_id)
             
             # Clean up inactive players (disconnected for more than 2 hours)
             inactive_players = []
-            for player_id, player in self.players.items():
+            for player_id, player in list(self.players.items()):
                 if not player.connected:
                     time_since_join = datetime.now() - player.joined_at
                     if time_since_join.total_seconds() > 7200:  # 2 hours
                         inactive_players.append(player_id)
             
             for player_id in inactive_players:
-                print(f"[CLEANUP] Removing inactive player: {player_id}")
-                del self.players[player_id]
+                logger.info("[CLEANUP] Removing inactive player: %s", player_id)
+                self.players.pop(player_id, None)
             
             if finished_games or inactive_players:
-                print(f"[CLEANUP] Cleaned up {len(finished_games)} games and {len(inactive_players)} players")
+                logger.info("[CLEANUP] Cleaned up %s games and %s players", len(finished_games), len(inactive_players))
     
     @debug_method
     def cleanup_empty_lobbies(self):
         """Clean up empty lobbies."""
         with self._cleanup_lock:
-            empty_lobbies = [lobby_id for lobby_id, lobby in self.lobbies.items() if not lobby.players]
+            empty_lobbies = [lobby_id for lobby_id, lobby in list(self.lobbies.items()) if not lobby.players]
             for lobby_id in empty_lobbies:
-                print(f"[CLEANUP] Removing empty lobby: {lobby_id}")
-                del self.lobbies[lobby_id]
+                logger.info("[CLEANUP] Removing empty lobby: %s", lobby_id)
+                lock = self._lobby_locks.get(lobby_id)
+                if lock is None:
+                    continue
+                with lock:
+                    lobby = self.lobbies.get(lobby_id)
+                    if lobby is not None and not lobby.players:
+                        del self.lobbies[lobby_id]
+                        self._lobby_locks.pop(lobby_id, None)
             
             if empty_lobbies:
-                print(f"[CLEANUP] Cleaned up {len(empty_lobbies)} empty lobbies")
\ No newline at end of file
+                logger.info("[CLEANUP] Cleaned up %s empty lobbies", len(empty_lobbies))
\ No newline at end of file
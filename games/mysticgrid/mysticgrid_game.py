@@ -2,14 +2,23 @@
 MysticGrid game implementation.
 """
 
+import time
+from functools import cached_property
 from flask import Blueprint
 from typing import Dict, Any
 from games.base_game import BaseGame
-from .routes import mysticgrid_bp, register_socket_handlers, game_manager
+from .routes import mysticgrid_bp, register_socket_handlers, game_manager, run_cleanup
 
 class MysticGridGame(BaseGame):
     """MysticGrid game implementation."""
     
+    # Seconds a stats snapshot is reused; the catalog and /api/stats poll it
+    STATS_TTL = 5.0
+    
+    def __init__(self):
+        self._stats = None
+        self._stats_at = 0.0
+    
     @property
     def name(self) -> str:
         """Unique identifier for the game."""
@@ -41,6 +50,11 @@ class MysticGridGame(BaseGame):
     
     def get_game_info(self) -> Dict[str, Any]:
         """Get detailed information about the game for the catalog."""
+        return {**self._catalog_info, 'stats': self.get_stats()}
+    
+    @cached_property
+    def _catalog_info(self) -> Dict[str, Any]:
+        """Fixed catalog fields, built once per instance."""
         return {
             'name': self.name,
             'display_name': self.display_name,
@@ -59,13 +73,20 @@ class MysticGridGame(BaseGame):
                 "You receive clues to help solve the puzzle",
                 "Correct solutions earn points",
                 "Work together to solve all cells!"
-            ],
-            'stats': self.get_stats()
+            ]
         }
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get current game statistics."""
-        return game_manager.get_stats()
+        """Get current game statistics, refreshed at most every STATS_TTL seconds."""
+        now = time.monotonic()
+        if self._stats is None or now - self._stats_at >= self.STATS_TTL:
+            self._stats = game_manager.get_stats()
+            self._stats_at = now
+        return self._stats
+    
+    def cleanup(self):
+        """Drop finished games and empty lobbies."""
+        run_cleanup()
     
     def register_socket_handlers(self, socketio):
         """Register socket handlers with the main socketio instance."""
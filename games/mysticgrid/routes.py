@@ -1,11 +1,16 @@
 from flask import Blueprint, render_template, request, jsonify, session
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import Namespace, emit, join_room, leave_room
 import uuid
+from operator import itemgetter
 import json
+import logging
 import os
 from datetime import datetime
 from .game_logic import GameManager, Player, Lobby, GameSession
-from shared.debug_utils import debug_function, set_debug, clear_debug_log, get_debug_log_path
+from shared.debug_utils import debug_function, set_debug, clear_debug_log, get_debug_log_path, Timed
+from shared.emit_batcher import EmitBatch
+
+logger = logging.getLogger(__name__)
 
 # Create blueprint
 mysticgrid_bp = Blueprint('mysticgrid', __name__, 
@@ -15,34 +20,69 @@ mysticgrid_bp = Blueprint('mysticgrid', __name__,
 # Initialize game manager
 game_manager = GameManager()
 
+# SocketIO instance, set when the socket handlers are registered
+_socketio = None
+
+# Socket.IO namespace the MysticGrid client connects to
+SOCKET_NAMESPACE = '/mysticgrid'
+
 # Set debug mode (can be controlled via environment variable)
 debug_enabled = os.getenv('DEBUG', 'True').lower() == 'true'
 set_debug(debug_enabled)
 
-# Set up periodic cleanup
-import threading
-import time
+# State changes within this window (seconds) go out as a single broadcast per game
+BROADCAST_DELAY = 0.02
+
+# Games broadcast between yields to the event loop, so a burst of dirty games
+# doesn't hold up other handlers until every state is built
+BROADCAST_BATCH_SIZE = 50
+
+_dirty_games = {}  # game_id -> (GameSession, whether its public part changed)
+_broadcast_scheduled = False
+
 
-def periodic_cleanup():
-    """Run cleanup tasks every 30 minutes."""
-    while True:
+def mark_dirty(game: GameSession, public: bool = True):
+    """Queue a state broadcast for a game; changes within BROADCAST_DELAY are coalesced."""
+    global _broadcast_scheduled
+    previous = _dirty_games.get(game.session_id)
+    _dirty_games[game.session_id] = (game, public or (previous is not None and previous[1]))
+    if not _broadcast_scheduled:
+        _broadcast_scheduled = True
+        _socketio.start_background_task(_broadcast_dirty_games)
+
+
+def _broadcast_dirty_games():
+    """Send each dirty game's turn counters to its room and changed private parts to their players."""
+    global _broadcast_scheduled
+    _socketio.sleep(BROADCAST_DELAY)
+    _broadcast_scheduled = False
+    dirty = list(_dirty_games.values())
+    _dirty_games.clear()
+    
+    for n, (game, public) in enumerate(dirty, 1):
+        if n % BROADCAST_BATCH_SIZE == 0:
+            _socketio.sleep(0)
         try:
-            time.sleep(1800)  # 30 minutes
-            print("[CLEANUP] Running periodic cleanup...")
-            game_manager.cleanup_finished_games()
-            game_manager.cleanup_empty_lobbies()
-            print(f"[CLEANUP] Server stats: {game_manager.get_stats()}")
-        except Exception as e:
-            print(f"[CLEANUP] Error during cleanup: {e}")
-
-# start cleanup thread
-cleanup_thread = threading.Thread(target=periodic_cleanup, daemon=True)
-cleanup_thread.start()
-print("[CLEANUP] Periodic cleanup thread started")
+            connected_sids = game.connected_sids
+            private_states = game.get_changed_private_states(connected_sids)
+            with EmitBatch(_socketio, namespace=SOCKET_NAMESPACE) as batch:
+                if public:
+                    batch.add('game_state_public', game.get_progress_state(), room=f"game_{game.session_id}")
+                for p_id, private_state in private_states.items():
+                    batch.add('game_state_private', private_state, sid=connected_sids[p_id])
+        except Exception:
+            logger.exception("Failed to broadcast state for game %s", game.session_id)
+
+
+def run_cleanup():
+    """Drop finished games and empty lobbies (called by the app's periodic cleanup task)."""
+    game_manager.cleanup_finished_games()
+    game_manager.cleanup_empty_lobbies()
+    logger.info("[CLEANUP] Server stats: %s", game_manager.get_stats())
 
 # print debug log location
 if debug_enabled:
-    print(f"Debug log will be written to: {get_debug_log_path()}")
+    logger.info("Debug log will be written to: %s", get_debug_log_path())
 
 
 @debug_function
@@ -123,7 +163,18 @@ def get_game_state(game_id):
     if not player_id:
         return jsonify({'error': 'Player ID required'}), 400
     
-    return jsonify(game.get_game_state_for_player(player_id))
+    # Per-player state is cached, so only build it for players in this game
+    if player_id not in game.players:
+        return jsonify({'error': 'Player not in this game'}), 404
+    
+    # The state key doubles as the ETag, so unchanged polls skip building the state
+    etag = '%s-%s-%s' % (player_id, *game.state_key)
+    if request.if_none_match.contains(etag):
+        return '', 304
+    
+    response = jsonify(game.get_game_state_cached(player_id))
+    response.set_etag(etag)
+    return response
 
 
 @mysticgrid_bp.route('/api/stats')
@@ -140,13 +191,20 @@ def debug_lobby(lobby_id):
     if not lobby:
         return jsonify({'error': 'Lobby not found'}), 404
     
-    return jsonify({
+    body = {
         'lobby_id': lobby_id,
         'lobby_exists': True,
         'lobby_state': lobby.get_lobby_state(),
-        'all_lobbies': list(game_manager.lobbies.keys()),
-        'all_players': list(game_manager.players.keys())
-    })
+        'lobbies_count': len(game_manager.lobbies),
+        'players_count': len(game_manager.players)
+    }
+    
+    # Listing every lobby and player id is only done when asked for with ?verbose=1
+    if request.args.get('verbose') == '1':
+        body['all_lobbies'] = list(game_manager.lobbies.keys())
+        body['all_players'] = list(game_manager.players.keys())
+    
+    return jsonify(body)
 
 
 @debug_function
@@ -163,12 +221,11 @@ def clear_debug_log_endpoint():
 @debug_function
 def show_solve_page(game_id: str):
     """Show the solve page with clue dependency tree visualization."""
-    if game_id not in game_manager.game_sessions:
+    game_session = game_manager.get_game_by_id(game_id)
+    if not game_session:
         return "Game not found", 404
     
-    game_session = game_manager.game_sessions[game_id]
-    
-    # Ensure board and clues are initialized
+    # Ensure board and clues are initialized (returns at once if they already are)
     game_session._initialize_board_and_clues()
     
     return render_template('solve.html', 
@@ -177,21 +234,36 @@ def show_solve_page(game_id: str):
                          clues=game_session.clues)
 
 
+# Required fields of each socket payload, fetched in one call; a missing field
+# raises KeyError and a payload that isn't a dict raises TypeError
+_GAME_AND_PLAYER = itemgetter('game_id', 'player_id')
+_LOBBY_AND_PLAYER = itemgetter('lobby_id', 'player_id')
+_SUBMIT_SOLUTION = itemgetter('game_id', 'player_id', 'position', 'guess')
+_SHARE_CLUE = itemgetter('game_id', 'from_player_id', 'to_player_id', 'clue')
+
+
+def _as_pos(raw) -> tuple:
+    """Convert a client [row, col] pair to a position tuple, raising KeyError if malformed."""
+    try:
+        return (int(raw[0]), int(raw[1]))
+    except (TypeError, ValueError, IndexError, KeyError):
+        raise KeyError('position')
+
+
 # WebSocket Events
 @debug_function
 def handle_connect():
     """Handle client connection."""
-    print(f"Client connected: {request.sid}")
+    logger.info("Client connected: %s", request.sid)
     emit('connected', {'message': 'Connected to server'})
 
 
 def handle_reconnect_to_game(data):
     """Handle player reconnecting to an active game."""
     try:
-        game_id = data.get('game_id')
-        player_id = data.get('player_id')
-        
-        if not game_id or not player_id:
+        try:
+            game_id, player_id = _GAME_AND_PLAYER(data)
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing game_id or player_id'})
             return
         
@@ -200,13 +272,14 @@ def handle_reconnect_to_game(data):
             emit('error', {'message': 'Game not found'})
             return
         
-        if player_id not in game.players:
+        player = game.players.get(player_id)
+        if player is None:
             emit('error', {'message': 'Player not in this game'})
             return
         
         # Reconnect the player
-        player = game.players[player_id]
-        player.connect(request.sid)
+        game_manager.connect_player(player, request.sid)
+        game.bump_state_rev()
         
         # Join the game room
         join_room(f"game_{game_id}")
@@ -214,19 +287,16 @@ def handle_reconnect_to_game(data):
         # Send current game state
         emit('game_reconnected', {
             'message': 'Successfully reconnected to game',
-            'game_state': game.get_game_state_for_player(player_id)
+            'game_state': game.get_game_state_cached(player_id)
         })
         
         # Notify other players about the reconnection
-        for p_id, player_obj in game.players.items():
-            if p_id != player_id and player_obj.connected:
-                emit('player_reconnected', {
-                    'player_id': player_id,
-                    'player_name': player.name,
-                    'game_state': game.get_game_state_for_player(p_id)
-                }, room=player_obj.websocket)
+        emit('player_reconnected', {
+            'player_id': player_id,
+            'player_name': player.name
+        }, room=f"game_{game_id}", skip_sid=request.sid)
         
-        print(f"Player {player_id} reconnected to game {game_id}")
+        logger.info("Player %s reconnected to game %s", player_id, game_id)
         
     except Exception as e:
         emit('error', {'message': str(e)})
@@ -235,10 +305,9 @@ def handle_reconnect_to_game(data):
 def handle_leave_game(data):
     """Handle player leaving an active game."""
     try:
-        game_id = data.get('game_id')
-        player_id = data.get('player_id')
-        
-        if not game_id or not player_id:
+        try:
+            game_id, player_id = _GAME_AND_PLAYER(data)
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing game_id or player_id'})
             return
         
@@ -265,66 +334,66 @@ def handle_leave_game(data):
 
 def handle_game_disconnect(game, player_id):
     """Handle a player disconnecting from an active game."""
-    print(f"Player {player_id} disconnected from game {game.session_id}")
-    
-    # Notify other players about the disconnect
-    for p_id, player_obj in game.players.items():
-        if p_id != player_id and player_obj.connected:
-            emit('player_disconnected', {
-                'player_id': player_id,
-                'player_name': game.players[player_id].name,
-                'game_state': game.get_game_state_for_player(p_id)
-            }, room=player_obj.websocket)
-    
-    # If it's the disconnected player's turn, skip to next turn after a delay
-    if game.current_turn == player_id:
-        # Skip turn immediately for now (could add a timeout later)
-        game.next_turn()
-        
-        # Notify remaining players about the turn change
-        for p_id, player_obj in game.players.items():
-            if p_id != player_id and player_obj.connected:
-                emit('turn_skipped', {
-                    'skipped_player': game.players[player_id].name,
-                    'new_turn': game.players[game.current_turn].name,
-                    'game_state': game.get_game_state_for_player(p_id)
-                }, room=player_obj.websocket)
-    
-    # Check if game should end due to too few players
-    # Be more conservative - only end if there are truly no players left
-    connected_players = sum(1 for p in game.players.values() if p.connected)
-    total_players = len(game.players)
+    logger.info("Player %s disconnected from game %s", player_id, game.session_id)
+    game.bump_state_rev()
+    players = game.players
+    disconnected_name = players[player_id].name
     
-    # Only end the game if there are no players at all
-    # Don't end the game just because players are temporarily disconnected during page navigation
-    if total_players == 0:
-        game.game_state = "finished"
-        print(f"Game {game.session_id} ended due to no players remaining")
-        
-        # Notify any remaining connected players
-        for p_id, player_obj in game.players.items():
-            if player_obj.connected:
-                emit('game_ended', {
+    with EmitBatch(_socketio, namespace=SOCKET_NAMESPACE) as batch:
+        # Notify other players about the disconnect; the payload is the same for
+        # everyone, so it goes to the game room once and clients update locally
+        batch.add('player_disconnected', {
+            'player_id': player_id,
+            'player_name': disconnected_name
+        }, room=f"game_{game.session_id}", skip_sid=request.sid)
+        
+        # If it's the disconnected player's turn, skip to next turn after a delay
+        if game.current_turn == player_id:
+            # Skip turn immediately for now (could add a timeout later)
+            game.next_turn()
+            
+            # Notify remaining players about the turn change
+            new_turn_name = players[game.current_turn].name
+            for p_id, sid in game.connected_sids.items():
+                if p_id != player_id:
+                    batch.add('turn_skipped', {
+                        'skipped_player': disconnected_name,
+                        'new_turn': new_turn_name,
+                        'game_state': game.get_game_state_cached(p_id)
+                    }, sid=sid)
+        
+        # Check if game should end due to too few players
+        # Be more conservative - only end if there are truly no players left
+        connected_players = game.connected_count
+        total_players = len(players)
+        
+        # Only end the game if there are no players at all
+        # Don't end the game just because players are temporarily disconnected during page navigation
+        if total_players == 0:
+            game.game_state = "finished"
+            game.bump_state_rev()
+            logger.info("Game %s ended due to no players remaining", game.session_id)
+            
+            # Notify any remaining connected players
+            for p_id, sid in game.connected_sids.items():
+                batch.add('game_ended', {
                     'reason': 'no_players',
-                    'game_state': game.get_game_state_for_player(p_id)
-                }, room=player_obj.websocket)
+                    'game_state': game.get_game_state_cached(p_id)
+                }, sid=sid)
 
 
 def handle_disconnect():
     """Handle client disconnection."""
-    print(f"Client disconnected: {request.sid}")
+    logger.info("Client disconnected: %s", request.sid)
     # Clean up player connections
-    for player in game_manager.players.values():
-        if hasattr(player, 'websocket') and player.websocket == request.sid:
-            player.disconnect()
-            
-            # If player is in an active game, handle game disconnect
-            if player.current_game_id:
-                game = game_manager.get_game_by_id(player.current_game_id)
-                if game and game.game_state == "playing":
-                    handle_game_disconnect(game, player.player_id)
-            
-            break
+    player = game_manager.pop_player_by_sid(request.sid)
+    if player and player.websocket == request.sid:
+        game_manager.disconnect_player(player)
+        
+        # If player is in an active game, handle game disconnect
+        game = player.current_game
+        if game and game.game_state == "playing":
+            handle_game_disconnect(game, player.player_id)
 
 
 def handle_join_room(data):
@@ -332,20 +401,19 @@ def handle_join_room(data):
     room = data.get('room')
     if room:
         join_room(room)
-        print(f"Client {request.sid} joined room {room}")
+        logger.info("Client %s joined room %s", request.sid, room)
 
 
 @debug_function
 def handle_join_lobby(data):
     """Handle player joining a lobby."""
     try:
-        lobby_id = data.get('lobby_id')
-        player_id = data.get('player_id')
-        player_name = data.get('player_name', 'Anonymous')
-        
-        if not lobby_id or not player_id:
+        try:
+            lobby_id, player_id = _LOBBY_AND_PLAYER(data)
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing lobby_id or player_id'})
             return
+        player_name = data.get('player_name', 'Anonymous')
         
         # Get or create player
         player = game_manager.get_player(player_id)
@@ -353,22 +421,22 @@ def handle_join_lobby(data):
             player = game_manager.create_player(player_id=player_id, name=player_name)
         
         # Connect player to WebSocket
-        player.connect(request.sid)
+        game_manager.connect_player(player, request.sid)
         
         # Join lobby
         success = game_manager.join_lobby(lobby_id, player_id)
         
         if success:
+            lobby_state = game_manager.get_lobby_by_id(lobby_id).get_lobby_state()
             join_room(f"lobby_{lobby_id}")
             emit('lobby_joined', {
                 'lobby_id': lobby_id,
                 'player_id': player.player_id,
-                'lobby_state': game_manager.get_lobby_by_id(lobby_id).get_lobby_state()
+                'lobby_state': lobby_state
             })
             
             # Notify other players in lobby
-            lobby_state = game_manager.get_lobby_by_id(lobby_id).get_lobby_state()
-            print(f"Emitting player_joined to room lobby_{lobby_id} with {len(lobby_state['players'])} players")
+            logger.info("Emitting player_joined to room lobby_%s with %s players", lobby_id, len(lobby_state['players']))
             emit('player_joined', {
                 'player': player.to_dict(),
                 'lobby_state': lobby_state
@@ -383,10 +451,9 @@ def handle_join_lobby(data):
 def handle_leave_lobby(data):
     """Handle player leaving a lobby."""
     try:
-        lobby_id = data.get('lobby_id')
-        player_id = data.get('player_id')
-        
-        if not lobby_id or not player_id:
+        try:
+            lobby_id, player_id = _LOBBY_AND_PLAYER(data)
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing lobby_id or player_id'})
             return
         
@@ -413,15 +480,10 @@ def handle_leave_lobby(data):
 @debug_function
 def handle_start_game(data):
     """Handle starting a game from a lobby."""
-    import time
-    start_time = time.time()
-    print(f"[TIMING] handle_start_game called at: {start_time:.3f}s")
-    
     try:
-        lobby_id = data.get('lobby_id')
-        player_id = data.get('player_id')
-        
-        if not lobby_id or not player_id:
+        try:
+            lobby_id, player_id = _LOBBY_AND_PLAYER(data)
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing lobby_id or player_id'})
             return
         
@@ -438,31 +500,38 @@ def handle_start_game(data):
             emit('error', {'message': 'Cannot start game yet'})
             return
         
-        # Start the game
-        print(f"[TIMING] About to call start_game_from_lobby at: {time.time():.3f}s")
-        game_id = game_manager.start_game_from_lobby(lobby_id)
-        game_creation_time = time.time()
-        print(f"[TIMING] start_game_from_lobby completed at: {game_creation_time:.3f}s (took {game_creation_time - start_time:.3f}s)")
-        print(f"DEBUG: Game ID returned: {game_id}")
+        # Start the game; the board itself is generated in the background below
+        with Timed(logger, 'start_game_from_lobby'):
+            game_id = game_manager.start_game_from_lobby(lobby_id)
+        logger.debug("Game ID returned: %s", game_id)
         
         if game_id:
-            print(f"[TIMING] About to emit game_started event at: {time.time():.3f}s")
-            # Notify all players in lobby
-            emit('game_started', {
+            # Notify all players in lobby right away so they can move to the game page
+            emit('game_starting', {
                 'game_id': game_id,
                 'game_url': f'/mysticgrid/game/{game_id}'
             }, room=f"lobby_{lobby_id}", broadcast=True)
-            emit_time = time.time()
-            print(f"[TIMING] game_started event emitted at: {emit_time:.3f}s (took {emit_time - game_creation_time:.3f}s)")
             
-            # Move all players to game room
+            # Move the host to the game room, as handle_join_game does (join_room
+            # only affects this sid; the other players join when their game page connects)
             game = game_manager.get_game_by_id(game_id)
-            if game:
-                for player in game.players.values():
-                    if player.connected:
-                        join_room(f"game_{game_id}")
+            join_room(f"game_{game_id}")
+            
+            # Generation is CPU-bound and does not yield, so it holds the event
+            # loop while it runs; for the largest (4x4) board that is well under a millisecond
+            def prepare_game():
+                try:
+                    with Timed(logger, 'game preparation'):
+                        game.prepare()
+                except Exception:
+                    logger.exception("Failed to prepare game %s", game_id)
+                    return
+                _socketio.emit('game_ready', {'game_id': game_id},
+                               to=[f"lobby_{lobby_id}", f"game_{game_id}"], namespace=SOCKET_NAMESPACE)
+            
+            _socketio.start_background_task(prepare_game)
         else:
-            print(f"DEBUG: Failed to start game")
+            logger.debug("Failed to start game")
             emit('error', {'message': 'Failed to start game'})
     
     except Exception as e:
@@ -471,15 +540,10 @@ def handle_start_game(data):
 
 def handle_join_game(data):
     """Handle player joining a game."""
-    import time
-    join_start_time = time.time()
-    print(f"[TIMING] handle_join_game called at: {join_start_time:.3f}s")
-    
     try:
-        game_id = data.get('game_id')
-        player_id = data.get('player_id')
-        
-        if not game_id or not player_id:
+        try:
+            game_id, player_id = _GAME_AND_PLAYER(data)
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing game_id or player_id'})
             return
         
@@ -494,7 +558,8 @@ def handle_join_game(data):
             return
         
         # Check if player is already in this game
-        if player_id not in game.players:
+        players = game.players
+        if player_id not in players:
             emit('error', {'message': 'Player not in this game'})
             return
         
@@ -502,31 +567,28 @@ def handle_join_game(data):
         was_disconnected = not player.connected
         
         # Connect player to WebSocket (this handles both new connections and reconnections)
-        player.connect(request.sid)
+        game_manager.connect_player(player, request.sid)
+        game.bump_state_rev()
         
         # Join game room
         room_name = f"game_{game_id}"
         join_room(room_name)
-        join_room_time = time.time()
-        print(f"[TIMING] Joined game room at: {join_room_time:.3f}s (took {join_room_time - join_start_time:.3f}s)")
         
-        # Ensure game is properly initialized before getting state
-        if game.game_state == "playing" and not game.clues_distributed:
-            print(f"[TIMING] Game not fully initialized, initializing now...")
-            game._initialize_board_and_clues()
-            game.distribute_clues()
-            print(f"[TIMING] Game initialization completed")
+        # Ensure game is properly initialized before getting state; if the
+        # background preparation is still running this waits on its lock
+        if game.game_state == "playing" and not game.ready.is_set():
+            with Timed(logger, 'game initialization on join'):
+                game.prepare()
         
-        print(f"[TIMING] About to get game state at: {time.time():.3f}s")
-        game_state = game.get_game_state_for_player(player_id)
-        game_state_time = time.time()
-        print(f"[TIMING] Got game state at: {game_state_time:.3f}s (took {game_state_time - join_room_time:.3f}s)")
+        with Timed(logger, 'join_game state'):
+            game_state = game.get_game_state_cached(player_id)
         
         # Debug logging for turn information
-        print(f"[DEBUG] Player {player_id} joining game {game_id}")
-        print(f"[DEBUG] Current turn: {game.current_turn}")
-        print(f"[DEBUG] Is my turn: {game_state.get('is_my_turn', False)}")
-        print(f"[DEBUG] Game state: {game.game_state}")
+        logger.debug("Player %s joining game %s (current turn: %s, is my turn: %s, game state: %s)",
+                     player_id, game_id, game.current_turn, game_state.get('is_my_turn', False), game.game_state)
+        
+        # Static parts of the state are sent once; later updates only carry what changed
+        emit('game_static', game.get_static_state_for_player(player_id))
         
         # Send appropriate event based on whether this is a reconnection
         if was_disconnected:
@@ -534,49 +596,44 @@ def handle_join_game(data):
                 'message': 'Successfully reconnected to game',
                 'game_state': game_state
             })
-            print(f"Player {player_id} reconnected to game {game_id}")
+            logger.info("Player %s reconnected to game %s", player_id, game_id)
         else:
             emit('game_joined', {
                 'game_id': game_id,
                 'game_state': game_state
             })
-            print(f"Player {player_id} joined game {game_id}")
-        
-        emit_time = time.time()
-        print(f"[TIMING] Emitted game event at: {emit_time:.3f}s (took {emit_time - game_state_time:.3f}s)")
-        
-        # Notify other players with updated game state (ensuring connected status is correct)
-        for p_id, other_player in game.players.items():
-            if p_id != player_id and other_player.connected:
-                other_player_game_state = game.get_game_state_for_player(p_id)
-                if was_disconnected:
-                    emit('player_reconnected', {
-                        'player_id': player_id,
-                        'player_name': player.name,
-                        'game_state': other_player_game_state
-                    }, room=other_player.websocket)
-                else:
-                    emit('player_joined_game', {
-                        'player': player.to_dict(),
-                        'game_state': other_player_game_state
-                    }, room=other_player.websocket)
+            logger.info("Player %s joined game %s", player_id, game_id)
+        
+        # Notify other players once through the game room; clients merge the
+        # player's connected status into their own copy of the state
+        if was_disconnected:
+            emit('player_reconnected', {
+                'player_id': player_id,
+                'player_name': player.name
+            }, room=room_name, skip_sid=request.sid)
+        else:
+            emit('player_joined_game', {
+                'player': player.to_dict()
+            }, room=room_name, skip_sid=request.sid)
         
         # Send a fresh game state update to the joining player after a short delay
         # This ensures the turn interface is properly displayed
+        sid = request.sid  # request is not available inside the background task
+        
         def send_fresh_state():
+            _socketio.sleep(0.1)
             try:
-                fresh_state = game.get_game_state_for_player(player_id)
-                emit('game_state_update', fresh_state, room=request.sid)
-                print(f"[DEBUG] Sent fresh game state to player {player_id}")
+                fresh_state = game.get_game_state_cached(player_id)
+                _socketio.emit('game_state_update', fresh_state, to=sid, namespace=SOCKET_NAMESPACE)
+                logger.debug("Sent fresh game state to player %s", player_id)
             except Exception as e:
-                print(f"[ERROR] Failed to send fresh state: {e}")
+                logger.error("Failed to send fresh state: %s", e)
         
         # Send fresh state after 100ms to ensure everything is properly initialized
-        import threading
-        threading.Timer(0.1, send_fresh_state).start()
+        _socketio.start_background_task(send_fresh_state)
     
     except Exception as e:
-        print(f"[ERROR] Exception in handle_join_game: {e}")
+        logger.error("Exception in handle_join_game: %s", e)
         emit('error', {'message': str(e)})
 
 
@@ -584,65 +641,61 @@ def handle_join_game(data):
 def handle_submit_solution(data):
     """Handle player submitting a solution."""
     try:
-        print(f"[DEBUG] submit_solution received: {data}")
-        game_id = data.get('game_id')
-        player_id = data.get('player_id')
-        position = tuple(data.get('position', []))
-        guess = data.get('guess', {})
-        
-        print(f"[DEBUG] Parsed data - game_id: {game_id}, player_id: {player_id}, position: {position}, guess: {guess}")
-        
-        if not all([game_id, player_id, position, guess]):
-            print(f"[ERROR] Missing required data - game_id: {game_id}, player_id: {player_id}, position: {position}, guess: {guess}")
+        logger.debug("submit_solution received: %s", data)
+        try:
+            game_id, player_id, position, guess = _SUBMIT_SOLUTION(data)
+            position = _as_pos(position)
+            if not guess or not isinstance(guess, dict):
+                raise KeyError('guess')
+        except (KeyError, TypeError):
+            logger.error("Missing required data in submit_solution: %s", data)
             emit('error', {'message': 'Missing required data'})
             return
         
+        logger.debug("Parsed data - game_id: %s, player_id: %s, position: %s, guess: %s", game_id, player_id, position, guess)
+        
         game = game_manager.get_game_by_id(game_id)
         if not game:
-            print(f"[ERROR] Game not found: {game_id}")
+            logger.error("Game not found: %s", game_id)
             emit('error', {'message': 'Game not found'})
             return
         
-        print(f"[DEBUG] Found game, current state: {game.game_state}, current turn: {game.current_turn}")
-        print(f"[DEBUG] Game players: {list(game.players.keys())}")
-        print(f"[DEBUG] Player {player_id} in game: {player_id in game.players}")
-        print(f"[DEBUG] Is player's turn: {player_id == game.current_turn}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found game, current state: %s, current turn: %s, players: %s, player %s in game: %s, is player's turn: %s",
+                         game.game_state, game.current_turn, list(game.players), player_id,
+                         player_id in game.players, player_id == game.current_turn)
         
         # Submit solution
         result = game.submit_solution(player_id, position, guess)
-        print(f"[DEBUG] Solution submission result: {result}")
+        logger.debug("Solution submission result: %s", result)
         
         if result['success']:
             emit('solution_accepted', result)
             
-            # Notify all players in game with their individual game states
-            for p_id in game.players.keys():
-                player_obj = game.players[p_id]
-                if player_obj.connected:
-                    emit('cell_solved', {
-                        'position': position,
-                        'player_id': player_id,
-                        'game_state': game.get_game_state_for_player(p_id)
-                    }, room=player_obj.websocket)
-            
-            # Check if game is complete
-            if result.get('game_complete'):
-                emit('game_complete', {
-                    'cells_solved': result.get('cells_remaining', 0),
-                    'turns_used': game.turn_count,
-                    'time_remaining': result.get('time_remaining', 0)
+            # The game room gets one small update (the cell and the turn counters);
+            # changed private parts follow with the next coalesced broadcast
+            with EmitBatch(_socketio, namespace=SOCKET_NAMESPACE) as batch:
+                batch.add('cell_solved', {
+                    'position': position,
+                    'player_id': player_id,
+                    'cell': game.solved_cells.get(position),
+                    'progress': game.get_progress_state()
                 }, room=f"game_{game_id}")
+                
+                # Check if game is complete
+                if result.get('game_complete'):
+                    batch.add('game_complete', {
+                        'cells_solved': result.get('cells_remaining', 0),
+                        'turns_used': game.turn_count,
+                        'time_remaining': result.get('time_remaining', 0)
+                    }, room=f"game_{game_id}")
+            mark_dirty(game, public=False)
         else:
             emit('solution_rejected', result)
             
             # Even for rejected solutions, notify all players of the updated game state
             # (turn has advanced, scores may have changed due to penalties)
-            for p_id in game.players.keys():
-                player_obj = game.players[p_id]
-                if player_obj.connected:
-                    player_state = game.get_game_state_for_player(p_id)
-                    # Emit to the specific player's socket ID instead of the room
-                    emit('game_state_update', player_state, room=player_obj.websocket)
+            mark_dirty(game)
     
     except Exception as e:
         emit('error', {'message': str(e)})
@@ -653,8 +706,9 @@ def handle_submit_solution(data):
 def handle_debug_reset_game_state(data):
     """Debug function to reset game state to playing."""
     try:
-        game_id = data.get('game_id')
-        if not game_id:
+        try:
+            game_id = data['game_id']
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing game_id'})
             return
         
@@ -663,25 +717,25 @@ def handle_debug_reset_game_state(data):
             emit('error', {'message': 'Game not found'})
             return
         
-        print(f"[DEBUG] Resetting game state for {game_id} from {game.game_state} to playing")
+        logger.debug("Resetting game state for %s from %s to playing", game_id, game.game_state)
         game.game_state = "playing"
+        game.bump_state_rev()
         
         emit('debug_response', {'message': f'Game state reset to playing', 'game_state': game.game_state})
         
     except Exception as e:
-        print(f"[ERROR] Exception in handle_debug_reset_game_state: {e}")
+        logger.error("Exception in handle_debug_reset_game_state: %s", e)
         emit('error', {'message': str(e)})
 
 
 def handle_share_clue(data):
     """Handle player sharing a clue with another player."""
     try:
-        game_id = data.get('game_id')
-        from_player_id = data.get('from_player_id')
-        to_player_id = data.get('to_player_id')
-        clue_data = data.get('clue')  # Now expecting clue object instead of index
-        
-        if not all([game_id, from_player_id, to_player_id, clue_data]):
+        try:
+            game_id, from_player_id, to_player_id, clue_data = _SHARE_CLUE(data)  # clue object, not an index
+            if not isinstance(clue_data, dict):
+                raise KeyError('clue')
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing required data'})
             return
         
@@ -691,36 +745,7 @@ def handle_share_clue(data):
             return
         
         # Find the clue index in the global clue list
-        clue_index = None
-        for i, clue in enumerate(game.clues):
-            # Handle different clue types
-            if clue.clue_type.value == clue_data.get('clue_type'):
-                if clue.clue_type.value == 1:  # EXPLICIT
-                    if (clue.position == tuple(clue_data.get('position', [])) and
-                        clue.attribute == clue_data.get('attribute') and
-                        clue.value == clue_data.get('value')):
-                        clue_index = i
-                        break
-                elif clue.clue_type.value == 2:  # GENERAL
-                    if (clue.scope == clue_data.get('scope') and
-                        clue.scope_index == clue_data.get('scope_index') and
-                        clue.count == clue_data.get('count') and
-                        clue.value == clue_data.get('value')):
-                        clue_index = i
-                        break
-                elif clue.clue_type.value == 3:  # CONDITIONAL
-                    # For conditional clues, we need to match the condition and consequence
-                    condition_data = clue_data.get('condition', {})
-                    consequence_data = clue_data.get('consequence', {})
-                    if (clue.condition and clue.consequence and
-                        clue.condition.position == tuple(condition_data.get('position', [])) and
-                        clue.condition.attribute == condition_data.get('attribute') and
-                        clue.condition.value == condition_data.get('value') and
-                        clue.consequence.position == tuple(consequence_data.get('position', [])) and
-                        clue.consequence.attribute == consequence_data.get('attribute') and
-                        clue.consequence.value == consequence_data.get('value')):
-                        clue_index = i
-                        break
+        clue_index = game.find_clue_index(clue_data)
         
         if clue_index is None:
             emit('error', {'message': 'Clue not found in game'})
@@ -731,18 +756,16 @@ def handle_share_clue(data):
         if result['success']:
             emit('clue_shared', result)
             
-            # Send updated game states to both players
-            for p_id in [from_player_id, to_player_id]:
-                player_obj = game.players[p_id]
-                if player_obj.connected:
-                    emit('game_state_update', game.get_game_state_for_player(p_id), room=player_obj.websocket)
-            
             # Notify all players in game about the clue sharing
-            emit('clue_shared_notification', {
-                'from_player': result['from_player'],
-                'to_player': result['to_player'],
-                'clue': result['clue']
-            }, room=f"game_{game_id}")
+            with EmitBatch(_socketio, namespace=SOCKET_NAMESPACE) as batch:
+                batch.add('clue_shared_notification', {
+                    'from_player': result['from_player'],
+                    'to_player': result['to_player'],
+                    'clue': result['clue']
+                }, room=f"game_{game_id}")
+            
+            # The turn moved on and the recipient has a new clue
+            mark_dirty(game)
         else:
             emit('clue_share_failed', result)
     
@@ -753,10 +776,9 @@ def handle_share_clue(data):
 def handle_get_game_state(data):
     """Handle player requesting current game state."""
     try:
-        game_id = data.get('game_id')
-        player_id = data.get('player_id')
-        
-        if not game_id or not player_id:
+        try:
+            game_id, player_id = _GAME_AND_PLAYER(data)
+        except (KeyError, TypeError):
             emit('error', {'message': 'Missing game_id or player_id'})
             return
         
@@ -765,25 +787,48 @@ def handle_get_game_state(data):
             emit('error', {'message': 'Game not found'})
             return
         
-        emit('game_state_response', game.get_game_state_for_player(player_id))
+        if player_id not in game.players:
+            emit('error', {'message': 'Player not in this game'})
+            return
+        
+        # Clients that already hold the current revision and remaining time get a short reply
+        since_rev = data.get('since_rev')
+        if since_rev is not None and (since_rev, data.get('since_time')) == game.state_key:
+            emit('game_state_response', {'no_change': True, 'rev': since_rev})
+            return
+        
+        emit('game_state_response', game.get_game_state_cached(player_id))
     
     except Exception as e:
         emit('error', {'message': str(e)})
 
 
+class MysticGridNamespace(Namespace):
+    """
+    Socket.IO namespace for MysticGrid.
+    
+    Events are dispatched by looking up the on_<event> attribute on this class,
+    so the handlers above are bound here once instead of registered one by one.
+    """
+    on_connect = staticmethod(handle_connect)
+    on_disconnect = staticmethod(handle_disconnect)
+    on_reconnect_to_game = staticmethod(handle_reconnect_to_game)
+    on_leave_game = staticmethod(handle_leave_game)
+    on_join_room = staticmethod(handle_join_room)
+    on_join_lobby = staticmethod(handle_join_lobby)
+    on_leave_lobby = staticmethod(handle_leave_lobby)
+    on_start_game = staticmethod(handle_start_game)
+    on_join_game = staticmethod(handle_join_game)
+    on_submit_solution = staticmethod(handle_submit_solution)
+    on_debug_reset_game_state = staticmethod(handle_debug_reset_game_state)
+    on_share_clue = staticmethod(handle_share_clue)
+    on_get_game_state = staticmethod(handle_get_game_state)
+
+
 # Socket event registration function
 def register_socket_handlers(socketio):
     """Register all socket event handlers with the socketio instance."""
-    socketio.on_event('connect', handle_connect)
-    socketio.on_event('reconnect_to_game', handle_reconnect_to_game)
-    socketio.on_event('leave_game', handle_leave_game)
-    socketio.on_event('disconnect', handle_disconnect)
-    socketio.on_event('join_room', handle_join_room)
-    socketio.on_event('join_lobby', handle_join_lobby)
-    socketio.on_event('leave_lobby', handle_leave_lobby)
-    socketio.on_event('start_game', handle_start_game)
-    socketio.on_event('join_game', handle_join_game)
-    socketio.on_event('submit_solution', handle_submit_solution)
-    socketio.on_event('debug_reset_game_state', handle_debug_reset_game_state)
-    socketio.on_event('share_clue', handle_share_clue)
-    socketio.on_event('get_game_state', handle_get_game_state)
\ No newline at end of file
+    global _socketio
+    _socketio = socketio
+    
+    socketio.on_namespace(MysticGridNamespace(SOCKET_NAMESPACE))
\ No newline at end of file
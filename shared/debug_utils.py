@@ -1,33 +1,62 @@
 """
 Debug utilities for the MysticGrid server.
 """
+import atexit
 import functools
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import time
 from datetime import datetime
 from typing import Any, Callable
 
 
-# global debug flag
-DEBUG = True  # set to false to disable debug output
+# global debug flag; read from the environment at import so the decorators below
+# can skip wrapping entirely when debugging is off
+DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
 DEBUG_LOG_FILE = "debug.log"  # file to write debug output to
 
+_log_listener = None  # QueueListener started by configure_logging()
+
+# Debug log lines are queued here and written to DEBUG_LOG_FILE by a background listener
+_debug_log_queue = queue.Queue(maxsize=10000)
+_debug_log_handler = None
+_debug_log_listener = None
+
+
+def _start_debug_log_writer():
+    """Start the background thread that writes queued debug log lines to the file."""
+    global _debug_log_handler, _debug_log_listener
+    if _debug_log_listener is not None:
+        return
+    
+    _debug_log_handler = logging.FileHandler(DEBUG_LOG_FILE, encoding='utf-8', delay=True)
+    _debug_log_listener = logging.handlers.QueueListener(_debug_log_queue, _debug_log_handler)
+    _debug_log_listener.start()
+    atexit.register(_debug_log_listener.stop)
+
 
 def write_debug_log(message: str):
-    """Write a debug message to the log file."""
+    """Queue a debug message for the log file; dropped if the writer falls behind."""
     if not DEBUG:
         return
     
+    if _debug_log_listener is None:
+        _start_debug_log_writer()
     try:
-        with open(DEBUG_LOG_FILE, 'a', encoding='utf-8') as f:
-            f.write(message + '\n')
-    except Exception as e:
-        print(f"Error writing to debug log: {e}")
+        _debug_log_queue.put_nowait(logging.makeLogRecord({'msg': message}))
+    except queue.Full:
+        pass
 
 
 def clear_debug_log():
     """Clear the debug log file."""
     try:
+        if _debug_log_handler is not None:
+            # Close the open stream; the handler reopens the file on its next write
+            _debug_log_handler.close()
         if os.path.exists(DEBUG_LOG_FILE):
             os.remove(DEBUG_LOG_FILE)
         print(f"Debug log cleared: {DEBUG_LOG_FILE}")
@@ -39,11 +68,17 @@ def debug_function(func: Callable) -> Callable:
     """
     Decorator that logs function calls, arguments, and return values when DEBUG=True.
     
+    If DEBUG is off when the function is decorated, the function is returned
+    unwrapped, so set_debug(True) later only traces functions decorated after it.
+    
     Usage:
         @debug_function
         def my_function(arg1, arg2=None):
             return arg1 + arg2
     """
+    if not DEBUG:
+        return func
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         if not DEBUG:
@@ -114,12 +149,17 @@ def debug_method(func: Callable) -> Callable:
     """
     Decorator specifically for class methods that includes self information.
     
+    Like debug_function, returns the method unwrapped when DEBUG is off.
+    
     Usage:
         class MyClass:
             @debug_method
             def my_method(self, arg1):
                 return self.value + arg1
     """
+    if not DEBUG:
+        return func
+    
     @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
         if not DEBUG:
@@ -188,6 +228,61 @@ def debug_method(func: Callable) -> Callable:
     return wrapper
 
 
+def configure_logging(debug: bool = False):
+    """
+    Configure the root logger to hand records to a background thread.
+    
+    Request handlers only put records on a queue; formatting and writing to
+    stderr happen on the QueueListener's thread. Messages use lazy %-style
+    arguments, so below the configured level they are never formatted.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if debug else logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+class Timed:
+    """
+    Context manager that logs how long its block took, at DEBUG level.
+    
+    The clock is only read when the logger has DEBUG enabled, so outside
+    debugging a timed block costs a single level check.
+    
+    Usage:
+        with Timed(logger, 'start_game_from_lobby'):
+            game_id = game_manager.start_game_from_lobby(lobby_id)
+    """
+    __slots__ = ('logger', 'label', 't0')
+    
+    def __init__(self, logger: logging.Logger, label: str):
+        self.logger = logger
+        self.label = label
+        self.t0 = None
+    
+    def __enter__(self):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.t0 = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.t0 is not None:
+            self.logger.debug("[TIMING] %s took %dus", self.label, (time.perf_counter_ns() - self.t0) // 1000)
+        return False
+
+
 def set_debug(enabled: bool):
     """Enable or disable debug output globally."""
     global DEBUG
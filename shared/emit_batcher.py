@@ -0,0 +1,56 @@
+"""
+Batched Socket.IO emits for per-player fan-out.
+"""
+from typing import Any, List, Optional, Tuple
+
+
+class EmitBatch:
+    """
+    Collects Socket.IO emits and sends them together when the batch exits.
+
+    Consecutive emits of the same event with equal payloads are merged into a
+    single emit addressed to all of their sids, so the payload is serialized
+    once. Merged emits go straight to the python-socketio server with the
+    resolved sid list rather than through one Flask-SocketIO emit per sid.
+    The batch is flushed in order when the block exits, so its events reach
+    each sid after anything the handler emitted before the block and before
+    anything it emits afterwards.
+
+    Usage:
+        with EmitBatch(socketio) as batch:
+            for player in players:
+                batch.add('cell_solved', state, sid=player.websocket)
+    """
+
+    def __init__(self, socketio, namespace: Optional[str] = None):
+        self.socketio = socketio
+        self.namespace = namespace
+        self._pending: List[Tuple[str, Any, List[str], Optional[str]]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def add(self, event: str, payload: Any, sid: Optional[str] = None, room: Optional[str] = None,
+            skip_sid: Optional[str] = None):
+        """Queue an emit to a single sid or to a room, optionally skipping one sid."""
+        target = sid if sid is not None else room
+        if self._pending:
+            last_event, last_payload, targets, last_skip_sid = self._pending[-1]
+            if (last_event == event and last_skip_sid == skip_sid
+                    and (last_payload is payload or last_payload == payload)):
+                targets.append(target)
+                return
+        self._pending.append((event, payload, [target], skip_sid))
+
+    def flush(self):
+        """Send every queued emit, in the order they were added."""
+        pending, self._pending = self._pending, []
+        server = self.socketio.server
+        for event, payload, targets, skip_sid in pending:
+            to = targets[0] if len(targets) == 1 else targets
+            server.emit(event, payload, to=to, skip_sid=skip_sid, namespace=self.namespace)
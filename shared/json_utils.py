@@ -0,0 +1,56 @@
+"""
+JSON encoding for HTTP responses and Socket.IO packets.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise. The module-level dumps/loads can be passed straight
+to SocketIO(json=...), which expects a json-like module.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional at runtime
+    orjson = None
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:  # pragma: no cover - Flask < 2.2
+    DefaultJSONProvider = object
+
+
+def dumps(obj, *args, **kwargs) -> str:
+    """Serialize obj to a JSON string. Extra json.dumps arguments are ignored by orjson."""
+    if orjson is None:
+        return json.dumps(obj, *args, **kwargs)
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def loads(s, *args, **kwargs):
+    """Deserialize a JSON string or bytes."""
+    if orjson is None:
+        return json.loads(s, *args, **kwargs)
+    return orjson.loads(s)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes responses with orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response from orjson's bytes, skipping the decode to str."""
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -5,7 +5,7 @@ document.addEventListener('DOMContentLoaded', function() {
     
     const socketInitTime = performance.now();
     console.log(`[TIMING] Initializing Socket.IO at: ${socketInitTime.toFixed(2)}ms (${(socketInitTime - pageLoadTime).toFixed(2)}ms after page load)`);
-    const socket = io();
+    const socket = io('/mysticgrid');
     const notificationBar = document.getElementById('notification-bar');
     const notificationIcon = notificationBar.querySelector('.notification-icon');
     const notificationMessage = notificationBar.querySelector('.notification-message');
@@ -34,6 +34,7 @@ document.addEventListener('DOMContentLoaded', function() {
     
     let playerId = null;
     let gameState = null;
+    let gameStatic = null;
     let selectedCell = null;
     let lastUpdateTime = Date.now();
     let pollingInterval = null;
@@ -174,8 +175,10 @@ document.addEventListener('DOMContentLoaded', function() {
         showStatus(`${data.player_name} disconnected`, 'info');
         if (data.game_state) {
             gameState = data.game_state;
-            updateGameDisplay();
+        } else {
+            applyPlayerPresence(data.player_id, false);
         }
+        updateGameDisplay();
     });
     
     socket.on('player_reconnected', function(data) {
@@ -183,8 +186,10 @@ document.addEventListener('DOMContentLoaded', function() {
         showStatus(`${data.player_name} reconnected`, 'success');
         if (data.game_state) {
             gameState = data.game_state;
-            updateGameDisplay();
+        } else {
+            applyPlayerPresence(data.player_id, true);
         }
+        updateGameDisplay();
     });
     
     socket.on('turn_skipped', function(data) {
@@ -227,13 +232,29 @@ document.addEventListener('DOMContentLoaded', function() {
 
     socket.on('player_joined_game', function(data) {
         console.log('Player joined game:', data);
+        if (data.player) {
+            applyPlayerPresence(data.player.player_id, true, data.player);
+        }
         updateGameDisplay();
     });
 
+    // Merge a player's connected status from a room-wide presence event into our state
+    function applyPlayerPresence(id, connected, player) {
+        if (!gameState || !gameState.players) return;
+        const existing = gameState.players.find(p => p.player_id === id);
+        if (existing) {
+            existing.connected = connected;
+        } else if (player) {
+            gameState.players.push(player);
+        }
+    }
+
     socket.on('cell_solved', function(data) {
         console.log('Cell solved event received:', data);
         // Update game state with the new data
-        if (data.game_state) {
+        if (data.progress) {
+            applySolvedCell(data);
+        } else if (data.game_state) {
             gameState = data.game_state;
         }
         updateGameDisplay();
@@ -324,6 +345,10 @@ document.addEventListener('DOMContentLoaded', function() {
     
     socket.on('game_state_response', function(data) {
         console.log('Game state response (from polling):', data);
+        if (data.no_change) {
+            lastUpdateTime = Date.now(); // Our copy is still current
+            return;
+        }
         gameState = data;
         lastUpdateTime = Date.now(); // Update timestamp
         updateGameDisplay();
@@ -332,6 +357,77 @@ document.addEventListener('DOMContentLoaded', function() {
         hideLoadingOverlay();
     });
 
+    socket.on('game_ready', function(data) {
+        console.log('Game ready:', data);
+        // The board finished generating after we joined; fetch it if we are still waiting
+        if (!gameState) {
+            socket.emit('get_game_state', {
+                game_id: gameId,
+                player_id: playerId
+            });
+        }
+    });
+
+    socket.on('game_static', function(data) {
+        console.log('Static game state received:', data);
+        gameStatic = data;
+    });
+
+    // The room-wide state and our own private part (clues, turn) arrive separately
+    socket.on('game_state_public', function(data) {
+        console.log('Public game state received:', data);
+        applyStatePart(data);
+    });
+
+    socket.on('game_state_private', function(data) {
+        console.log('Private game state received:', data);
+        applyStatePart(data);
+    });
+
+    // Merge one part of the state into ours. Without a full state to merge
+    // into, ask for it instead.
+    function applyStatePart(part) {
+        if (!gameState) {
+            socket.emit('get_game_state', {
+                game_id: gameId,
+                player_id: playerId
+            });
+            return;
+        }
+        gameState = Object.assign({}, gameStatic, gameState, part);
+        lastUpdateTime = Date.now(); // Update timestamp
+        updateGameDisplay();
+        startTimer(); // Start the countdown timer
+        hideLoadingOverlay();
+    }
+
+    // Apply a solved cell plus the turn counters broadcast with it. If our
+    // solved cells no longer add up to the server's count we missed an update,
+    // so ask for the full state.
+    function applySolvedCell(data) {
+        if (!gameState) {
+            applyStatePart(data.progress);
+            return;
+        }
+        const solvedCells = Object.assign({}, gameState.solved_cells);
+        if (data.cell) {
+            solvedCells[`${data.position[0]},${data.position[1]}`] = data.cell;
+        }
+        // Entries only ever gain revealed attributes, so a missed update shows up
+        // either as a missing entry or as one fully solved cell too few
+        const cells = Object.values(solvedCells);
+        const fullySolved = cells.filter(cell => cell.revealed.shape && cell.revealed.number).length;
+        if (fullySolved !== data.progress.cells_solved || cells.length !== data.progress.cells_revealed) {
+            console.log(`Solved cells out of step (have ${fullySolved} solved of ${cells.length}, server has ${data.progress.cells_solved} of ${data.progress.cells_revealed}), requesting full state`);
+            socket.emit('get_game_state', {
+                game_id: gameId,
+                player_id: playerId
+            });
+            return;
+        }
+        applyStatePart(Object.assign({}, data.progress, { solved_cells: solvedCells }));
+    }
+
     // Duplicate handler removed - using the one above
 
     socket.on('error', function(data) {
@@ -838,7 +934,9 @@ document.addEventListener('DOMContentLoaded', function() {
                 console.log('No updates for 10+ seconds, requesting fresh game state...');
                 socket.emit('get_game_state', {
                     game_id: gameId,
-                    player_id: playerId
+                    player_id: playerId,
+                    since_rev: gameState ? gameState.rev : null,
+                    since_time: gameState ? gameState.time_remaining : null
                 });
             }
         }, 5000);
@@ -1,6 +1,6 @@
 // Lobby page JavaScript
 document.addEventListener('DOMContentLoaded', function() {
-    const socket = io();
+    const socket = io('/mysticgrid');
     const statusMessage = document.getElementById('status-message');
     const playersList = document.getElementById('players-list');
     const startGameBtn = document.getElementById('start-game-btn');
@@ -111,15 +111,15 @@ document.addEventListener('DOMContentLoaded', function() {
         showStatus('A player left the lobby', 'info');
     });
 
-    socket.on('game_started', function(data) {
+    socket.on('game_starting', function(data) {
         const gameStartedTime = performance.now();
-        console.log(`[TIMING] Game started event received at: ${gameStartedTime.toFixed(2)}ms`);
-        console.log('Game started:', data);
+        console.log(`[TIMING] Game starting event received at: ${gameStartedTime.toFixed(2)}ms`);
+        console.log('Game starting:', data);
         showStatus('Game starting...', 'success');
         
         // Redirect to game page immediately
         const redirectTime = performance.now();
-        console.log(`[TIMING] Redirecting to game page at: ${redirectTime.toFixed(2)}ms (${(redirectTime - gameStartedTime).toFixed(2)}ms after game_started event)`);
+        console.log(`[TIMING] Redirecting to game page at: ${redirectTime.toFixed(2)}ms (${(redirectTime - gameStartedTime).toFixed(2)}ms after game_starting event)`);
         window.location.href = data.game_url;
     });
 